@@ -0,0 +1,197 @@
+"""
+Times the solvers on the puzzle corpora in benchmarks/corpora (see generate_corpora.py).
+
+For each corpus and engine this reports the puzzles solved per second, the 50th, 95th and 99th percentile time to
+solve one puzzle, and the peak memory used while solving the first MEMORY_PUZZLES puzzles of the corpus.
+The engines are:
+    state   sudoku_solver with engine="state", one puzzle at a time
+    dlx     sudoku_solver with engine="dlx", one puzzle at a time
+    batch   sudoku_solver_batch on the whole corpus at once. It has no time per puzzle, so only puzzles per second
+            and memory are reported
+
+Every solution is checked, and the benchmark stops if one is wrong.
+
+Usage:
+    python benchmarks/bench.py [--corpora easy hard] [--engines state dlx batch] [--repeat 3]
+                               [--json results.json] [--compare old_results.json]
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+REPO_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPORA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpora")
+
+CORPORA = ["easy", "medium", "hard", "minimal17", "worst_case"]
+ENGINES = ["state", "dlx", "batch"]
+
+# The number of puzzles from each corpus that are solved to measure peak memory. tracemalloc makes solving many
+# times slower, and the peak doesn't grow with the number of puzzles solved one at a time
+MEMORY_PUZZLES = 20
+
+
+sys.path.insert(0, REPO_DIRECTORY)
+import sudoku_solver as solver  # noqa: E402
+
+
+def load_corpus(name):
+    """Returns the puzzles of a corpus as a Nx9x9 numpy array"""
+    with open(os.path.join(CORPORA_DIRECTORY, name + ".txt")) as corpus_file:
+        return np.array(list(solver.read_puzzles(corpus_file)))
+
+
+def check_solutions(puzzles, solutions):
+    """Raises AssertionError if any solution is not a full valid sudoku that keeps the clues of its puzzle"""
+    solutions = np.asarray(solutions).reshape(-1, 9, 9)
+    boxes = solutions.reshape(-1, 3, 3, 3, 3).transpose(0, 1, 3, 2, 4).reshape(-1, 9, 9)
+
+    for units in (solutions, solutions.transpose(0, 2, 1), boxes):
+        assert (np.sort(units, axis=2) == np.arange(1, 10)).all(), "a solution is not a valid sudoku"
+
+    clues = puzzles != 0
+    assert (solutions[clues] == puzzles[clues]).all(), "a solution doesn't keep the clues of its puzzle"
+
+
+def solve_corpus(puzzles, engine):
+    """
+    Solves every puzzle with the engine
+
+    Output:
+        (solutions as a Nx9x9 numpy array, list of seconds taken for each puzzle or None for the batch engine)
+    """
+    if engine == "batch":
+        return solver.sudoku_solver_batch(puzzles), None
+
+    solutions = np.empty_like(puzzles)
+    latencies = []
+    for index, puzzle in enumerate(puzzles):
+        start = time.perf_counter()
+        solutions[index] = solver.sudoku_solver(puzzle, engine)
+        latencies.append(time.perf_counter() - start)
+
+    return solutions, latencies
+
+
+def bench(puzzles, engine, repeat):
+    """
+    Times an engine on the puzzles, solving them all repeat times. Peak memory is measured in a separate pass
+    over the first MEMORY_PUZZLES puzzles, as tracemalloc slows down the solvers
+
+    Output:
+        dict of results, times in milliseconds and memory in kilobytes
+    """
+    run_times = []
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        solutions, run_latencies = solve_corpus(puzzles, engine)
+        run_times.append(time.perf_counter() - start)
+
+        check_solutions(puzzles, solutions)
+        if run_latencies is not None:
+            latencies.extend(run_latencies)
+
+    tracemalloc.start()
+    solve_corpus(puzzles[:MEMORY_PUZZLES], engine)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    result = {
+        "puzzles": len(puzzles),
+        "puzzles_per_second": len(puzzles) / float(np.median(run_times)),
+        "peak_memory_kb": peak_memory / 1024,
+    }
+
+    for percentile in (50, 95, 99):
+        result["p{}_ms".format(percentile)] = float(np.percentile(latencies, percentile)) * 1000 if latencies else None
+
+    return result
+
+
+def environment():
+    """Returns a dict describing the machine and code the benchmark was run on"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIRECTORY, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+
+    return {
+        "commit": commit,
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "platform": platform.platform(),
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def format_number(value, digits=2):
+    return "-" if value is None else "{:.{}f}".format(value, digits)
+
+
+def print_results(results, previous=None):
+    """
+    Prints a table of the results. If previous results are given, the change in puzzles per second and p50 time
+    is printed next to each result, as new / old
+    """
+    header = "{:<12} {:<6} {:>8} {:>12} {:>9} {:>9} {:>9} {:>11}".format(
+        "corpus", "engine", "puzzles", "puzzles/s", "p50 ms", "p95 ms", "p99 ms", "peak kb")
+    if previous is not None:
+        header += " {:>12} {:>9}".format("puzzles/s x", "p50 x")
+    print(header)
+
+    for corpus, engine_results in results.items():
+        for engine, result in engine_results.items():
+            line = "{:<12} {:<6} {:>8} {:>12} {:>9} {:>9} {:>9} {:>11}".format(
+                corpus, engine, result["puzzles"], format_number(result["puzzles_per_second"], 1),
+                format_number(result["p50_ms"], 3), format_number(result["p95_ms"], 3),
+                format_number(result["p99_ms"], 3), format_number(result["peak_memory_kb"], 1))
+
+            if previous is not None:
+                old = previous.get(corpus, {}).get(engine)
+                speedup = p50_change = None
+                if old is not None:
+                    speedup = result["puzzles_per_second"] / old["puzzles_per_second"]
+                    if result["p50_ms"] is not None and old["p50_ms"]:
+                        p50_change = result["p50_ms"] / old["p50_ms"]
+                line += " {:>12} {:>9}".format(format_number(speedup), format_number(p50_change))
+
+            print(line)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Times the sudoku solvers on the benchmark corpora")
+    parser.add_argument("--corpora", nargs="+", choices=CORPORA, default=CORPORA, help="corpora to solve (default all)")
+    parser.add_argument("--engines", nargs="+", choices=ENGINES, default=ENGINES, help="engines to time (default all)")
+    parser.add_argument("--repeat", type=int, default=3, help="times to solve each corpus (default 3)")
+    parser.add_argument("--json", help="write the results to this JSON file")
+    parser.add_argument("--compare", help="compare against the results in this JSON file, written by --json")
+    args = parser.parse_args(argv)
+
+    previous = None
+    if args.compare is not None:
+        with open(args.compare) as previous_file:
+            previous = json.load(previous_file)["results"]
+
+    results = {}
+    for corpus in args.corpora:
+        puzzles = load_corpus(corpus)
+        results[corpus] = {engine: bench(puzzles, engine, args.repeat) for engine in args.engines}
+
+    print_results(results, previous)
+
+    if args.json is not None:
+        with open(args.json, "w") as output_file:
+            json.dump({"environment": environment(), "results": results}, output_file, indent=2)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
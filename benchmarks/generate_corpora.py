@@ -0,0 +1,161 @@
+"""
+Generates the puzzle corpora in benchmarks/corpora that bench.py times the solvers on.
+
+Every corpus is made from a fixed seed, so running this again gives the same files. Each corpus is a file of
+puzzles in the one line format, one per line:
+    easy.txt        puzzles with 36 clues and a unique solution
+    medium.txt      minimal puzzles (no clue can be removed without losing the unique solution) that can be
+                    solved by filling in singles alone
+    hard.txt        minimal puzzles that SudokuState has to guess on with singles alone
+    minimal17.txt   random transforms of known 17 clue puzzles, the fewest clues a unique puzzle can have
+    worst_case.txt  known puzzles made to be slow for naive backtracking, each followed by random transforms of it
+
+Usage:
+    python benchmarks/generate_corpora.py [--seed 2023] [--size 100]
+"""
+import argparse
+import os
+import random
+import sys
+
+import numpy as np
+
+REPO_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CORPORA_DIRECTORY = os.path.join(os.path.dirname(os.path.abspath(__file__)), "corpora")
+
+
+sys.path.insert(0, REPO_DIRECTORY)
+import sudoku_solver as solver  # noqa: E402
+from sudoku_solver import canonical, tables  # noqa: E402
+
+# Every order of rows (or columns) that keeps a sudoku valid
+LINE_ORDERS = canonical.build_line_orders()
+
+# Known 17 clue puzzles with a unique solution
+SEVENTEEN_CLUE_PUZZLES = [
+    "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",
+    "000000010400000000020000000000050407008000300001090000300400200050100000000806000",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+    "52...6.........7.13...........4..8..6......5...........418.........3..2...87.....",
+    "6.....8.3.4.7.................5.4.7.3..2.....1.6.......2.....5.....8.6......1....",
+]
+
+# Known puzzles that are slow to solve by trying values in order.
+# The first was made to be slow for naive backtracking, the others are well known as very hard puzzles
+WORST_CASE_PUZZLES = [
+    "..............3.85..1.2.......5.7.....4...1...9.......5......73..2.1........4...9",
+    "1.......2.9.4...5...6...7...5.9.3.......7.......85..4.7.....6...3...9.8...2.....1",
+    "1....7.9..3..2...8..96..5....53..9...1..8...26....4...3......1..4......7..7...3..",
+    "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4..",
+    "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......",
+]
+
+
+def random_full_grid(rng):
+    """Returns a random solved sudoku as a flat list of 81 ints, by filling squares in order with shuffled values"""
+    grid = [0] * 81
+
+    def fill(square):
+        if square == 81:
+            return True
+
+        used = {grid[neighbour] for neighbour in tables.PEERS[square]}
+        values = [value for value in range(1, 10) if value not in used]
+        rng.shuffle(values)
+
+        for value in values:
+            grid[square] = value
+            if fill(square + 1):
+                return True
+
+        grid[square] = 0
+        return False
+
+    fill(0)
+    return grid
+
+
+def remove_clues(grid, rng, target_clues=0):
+    """
+    Removes clues from a solved grid in a random order, skipping any that would make the solution not unique,
+    until target_clues are left or no more can be removed. Returns the puzzle as a flat list
+    """
+    puzzle = grid[:]
+    squares = list(range(81))
+    rng.shuffle(squares)
+
+    clues = 81
+    for square in squares:
+        if clues <= target_clues:
+            break
+
+        value = puzzle[square]
+        puzzle[square] = 0
+        if solver.has_unique_solution(np.array(puzzle).reshape(9, 9)):
+            clues -= 1
+        else:
+            puzzle[square] = value
+
+    return puzzle
+
+
+def random_transform(rng):
+    """Returns a random Transform (see sudoku_solver.canonical)"""
+    values = list(range(1, 10))
+    rng.shuffle(values)
+    return canonical.Transform(rng.random() < 0.5, rng.choice(LINE_ORDERS), rng.choice(LINE_ORDERS),
+                               tuple([0] + values))
+
+
+def needs_guessing(puzzle):
+    """
+    Returns True if SudokuState guesses at least once to solve the puzzle when filling in singles alone, so that the
+    corpora don't change when the default techniques do
+    """
+    solution, stats = solver.sudoku_solver(np.array(puzzle).reshape(9, 9), stats=True, techniques=())
+    return stats.guesses > 0
+
+
+def generate_corpora(seed, size):
+    """Returns a dict of {corpus name: list of puzzle lines}"""
+    rng = random.Random(seed)
+    corpora = {"easy": [], "medium": [], "hard": []}
+
+    while len(corpora["easy"]) < size:
+        corpora["easy"].append(remove_clues(random_full_grid(rng), rng, target_clues=36))
+
+    while len(corpora["medium"]) < size or len(corpora["hard"]) < size:
+        puzzle = remove_clues(random_full_grid(rng), rng)
+        corpus = corpora["hard"] if needs_guessing(puzzle) else corpora["medium"]
+        if len(corpus) < size:
+            corpus.append(puzzle)
+
+    corpora["minimal17"] = [solver.apply_transform(solver.line_to_puzzle(line), random_transform(rng))
+                            for line in SEVENTEEN_CLUE_PUZZLES for _ in range(size * 2 // len(SEVENTEEN_CLUE_PUZZLES))]
+
+    corpora["worst_case"] = []
+    for line in WORST_CASE_PUZZLES:
+        corpora["worst_case"].append(solver.line_to_puzzle(line))
+        for _ in range(9):
+            corpora["worst_case"].append(solver.apply_transform(solver.line_to_puzzle(line), random_transform(rng)))
+
+    return {name: [solver.puzzle_to_line(np.array(puzzle).reshape(9, 9)) for puzzle in puzzles]
+            for name, puzzles in corpora.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generates the benchmark puzzle corpora")
+    parser.add_argument("--seed", type=int, default=2023, help="random seed (default 2023)")
+    parser.add_argument("--size", type=int, default=100,
+                        help="puzzles in the easy, medium and hard corpora, and half the 17 clue corpus (default 100)")
+    args = parser.parse_args()
+
+    os.makedirs(CORPORA_DIRECTORY, exist_ok=True)
+    for name, lines in generate_corpora(args.seed, args.size).items():
+        with open(os.path.join(CORPORA_DIRECTORY, name + ".txt"), "w") as corpus_file:
+            corpus_file.write("\n".join(lines) + "\n")
+        print("{}: {} puzzles".format(name, len(lines)))
+
+
+if __name__ == "__main__":
+    main()
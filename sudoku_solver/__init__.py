@@ -0,0 +1,53 @@
+"""
+Solves 9x9 sudokus. Enter a 9x9 numpy array of numbers, zeros being a blank space, into sudoku_solver, and it will
+return a numpy array of the solved sudoku, or one containing all -1 if the sudoku can't be solved.
+solve_values and solve_string do the same for flat lists of 81 ints and one line strings, without numpy.
+
+Importing the package doesn't import numpy. The parts that work on numpy arrays of many puzzles at once (batches,
+caches, processes, asyncio, files of puzzles, the server) are only imported the first time one of their names is
+used, and numpy along with them
+"""
+import importlib
+
+from .dlx import DancingLinksSolver
+from .grading import GRADING_TECHNIQUES, TECHNIQUE_DIFFICULTY, Grade, grade_puzzle
+from .limits import SolveLimitExceeded, SolveLimits
+from .solver import ENGINES, count_solutions, has_unique_solution, solve_string, solve_values, sudoku_solver
+from .state import FISH_TECHNIQUES, NARROW_TECHNIQUES, SUBSET_TECHNIQUES, TECHNIQUES, SudokuState, get_techniques
+from .stats import SolveStats
+
+# The names that are imported from a module the first time they are used, by module
+LAZY_NAMES = {
+    "batch": ("narrow_batch", "sudoku_solver_batch"),
+    "canonical": ("Transform", "apply_transform", "undo_transform", "canonical_form"),
+    "cache": ("SolutionCache", "DiskSolutionCache"),
+    "parallel": ("puzzle_to_record", "records_to_puzzles", "solve_many"),
+    "aio": ("solve_async", "solve_many_async"),
+    "server": ("MicroBatcher", "SolveServer", "serve"),
+    "generator": ("random_solution", "remove_clues", "generate_puzzle", "generate_puzzles"),
+    "lineformat": ("line_to_puzzle", "puzzle_to_line", "read_puzzles", "solve_lines", "solve_fixed_width_file"),
+    "cli": ("main",),
+}
+
+LAZY_MODULES = {name: module for module, names in LAZY_NAMES.items() for name in names}
+
+__all__ = [
+    "DancingLinksSolver", "GRADING_TECHNIQUES", "TECHNIQUE_DIFFICULTY", "Grade", "grade_puzzle", "ENGINES",
+    "count_solutions", "has_unique_solution", "solve_string", "solve_values", "sudoku_solver", "FISH_TECHNIQUES",
+    "NARROW_TECHNIQUES", "SUBSET_TECHNIQUES", "TECHNIQUES", "SudokuState", "get_techniques", "SolveStats",
+    "SolveLimitExceeded", "SolveLimits",
+] + list(LAZY_MODULES)
+
+
+def __getattr__(name):
+    """Imports the module a name in LAZY_NAMES is in, the first time the name is used"""
+    if name not in LAZY_MODULES:
+        raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+    value = getattr(importlib.import_module("." + LAZY_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(LAZY_MODULES))
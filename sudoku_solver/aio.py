@@ -0,0 +1,145 @@
+"""
+Solving puzzles from asyncio code, without blocking the event loop.
+
+The solving is done by an executor (a thread pool by default, or a process pool to use more than one CPU), and
+the event loop only waits for it. A hard puzzle still takes as long to solve, but other coroutines keep running
+while it does
+"""
+import asyncio
+import collections
+import os
+import time
+
+from .limits import SolveLimitExceeded
+from .solver import get_engine, solve_values
+from .state import values_to_numpy
+
+
+async def solve_async(sudoku_puzzle, *, executor=None, timeout=None, semaphore=None, engine="state",
+                      techniques=None, max_nodes=None):
+    """
+    Solves a Sudoku puzzle in an executor, and returns its unique solution
+
+    Input
+        sudoku_puzzle : 9x9 numpy array
+            Empty cells are designated by 0.
+        executor : concurrent.futures.Executor
+            The executor the puzzle is solved in. Defaults to the event loop's default executor, a thread pool.
+            A ProcessPoolExecutor lets puzzles be solved on many CPUs at once, as the solvers hold the GIL
+        timeout : float
+            The most seconds to wait for the solution, including time spent waiting for the semaphore.
+            Raises TimeoutError if it runs out. The same time is given to the solver as its deadline, so the
+            worker stops solving soon after, rather than carrying on with a result that will be thrown away
+        semaphore : asyncio.Semaphore
+            If given, the puzzle is only handed to the executor once the semaphore is acquired, so that sharing
+            one semaphore between callers limits how many puzzles are being solved at once
+        engine, techniques, max_nodes : see sudoku_solver
+
+    Output
+        9x9 int8 numpy array
+            It contains the solution, if there is one. If there is no solution, all array entries are -1.
+
+    Raises SolveLimitExceeded if max_nodes is reached
+    """
+    # Checks the engine and techniques here, so that a mistake raises straight away rather than in the executor
+    get_engine(engine, techniques)
+
+    # Sent to the executor as a flat list, so that a process pool only has to pickle 81 ints
+    values = [int(value) for row in sudoku_puzzle for value in row]
+
+    # time.monotonic is the same clock in every process, so the deadline also works with a process pool
+    deadline = None if timeout is None else time.monotonic() + timeout
+
+    async def solve():
+        loop = asyncio.get_running_loop()
+
+        if semaphore is None:
+            return await loop.run_in_executor(executor, solve_values, values, engine, techniques, max_nodes, deadline)
+
+        async with semaphore:
+            return await loop.run_in_executor(executor, solve_values, values, engine, techniques, max_nodes, deadline)
+
+    try:
+        return values_to_numpy(await asyncio.wait_for(solve(), timeout))
+    except SolveLimitExceeded as error:
+        # The solver can reach the deadline just before wait_for does
+        if error.reason == "deadline":
+            raise TimeoutError("Solving took longer than {} seconds".format(timeout)) from error
+        raise
+
+
+async def iterate_puzzles(sudoku_puzzles):
+    """Yields the puzzles of an iterable or an async iterable"""
+    if hasattr(sudoku_puzzles, "__aiter__"):
+        async for puzzle in sudoku_puzzles:
+            yield puzzle
+    else:
+        for puzzle in sudoku_puzzles:
+            yield puzzle
+
+
+async def solve_many_async(sudoku_puzzles, *, executor=None, timeout=None, concurrency=None, semaphore=None,
+                           ordered=True, engine="state", techniques=None, max_nodes=None):
+    """
+    Solves puzzles in an executor, see solve_async. An async generator, so puzzles are read from sudoku_puzzles as
+    they are needed. No more than concurrency puzzles are read ahead of the solutions that have been yielded, so a
+    slow consumer, or a slow puzzle when ordered is True, stops more puzzles being read rather than letting
+    solutions pile up
+
+    Input
+        sudoku_puzzles : iterable or async iterable of 9x9 numpy arrays
+            Empty cells are designated by 0.
+        executor, timeout, semaphore, engine, techniques, max_nodes : see solve_async
+            timeout is for each puzzle on its own
+        concurrency : int
+            The most puzzles that are being solved, or waiting to be yielded, at once.
+            Defaults to twice the number of CPUs
+        ordered : bool
+            If True, the solutions are yielded in the same order as the puzzles. If False, they are yielded as
+            soon as they are solved, along with the index of the puzzle
+
+    Output
+        Yields 9x9 int8 numpy arrays, or (index, 9x9 numpy array) pairs if ordered is False.
+        Each array is the solution, or all -1 if the puzzle has no solution.
+        If a puzzle times out, TimeoutError is raised, and the puzzles still being solved are cancelled
+    """
+    concurrency = concurrency or (os.cpu_count() or 1) * 2
+
+    def submit(puzzle):
+        return asyncio.ensure_future(solve_async(puzzle, executor=executor, timeout=timeout, semaphore=semaphore,
+                                                 engine=engine, techniques=techniques, max_nodes=max_nodes))
+
+    if ordered:
+        pending = collections.deque()
+    else:
+        # Dict of {task: index of its puzzle}
+        pending = {}
+
+    try:
+        index = 0
+        async for puzzle in iterate_puzzles(sudoku_puzzles):
+            if ordered:
+                if len(pending) >= concurrency:
+                    yield await pending.popleft()
+                pending.append(submit(puzzle))
+
+            else:
+                if len(pending) >= concurrency:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        yield pending.pop(task), task.result()
+                pending[submit(puzzle)] = index
+
+            index += 1
+
+        while pending:
+            if ordered:
+                yield await pending.popleft()
+
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield pending.pop(task), task.result()
+    finally:
+        for task in pending:
+            task.cancel()
@@ -0,0 +1,169 @@
+"""
+Solving many sudokus at once, narrowed down together with numpy
+"""
+import numpy as np
+
+from .limits import SolveLimitExceeded
+from .solver import sudoku_solver
+from .tables import ALL_VALUES, BIT_COUNT, FILLED, LOWEST_VALUE, SQUARE_UNIT_INDEXES, UNITS
+
+# numpy versions of the lookup tables, for working on many sudokus at once (see narrow_batch)
+UNITS_ARRAY = np.array(UNITS, dtype=np.intp)
+SQUARE_UNIT_INDEXES_ARRAY = np.array(SQUARE_UNIT_INDEXES, dtype=np.intp)
+BIT_COUNT_ARRAY = np.array(BIT_COUNT, dtype=np.uint8)
+LOWEST_VALUE_ARRAY = np.array(LOWEST_VALUE, dtype=np.int8)
+
+# The most sudokus narrowed down together. narrow_batch makes temporary arrays of about 3 kilobytes per sudoku,
+# so larger batches are worked on this many at a time to keep the memory used the same however big the batch is
+CHUNK_SIZE = 8192
+
+
+def narrow_batch(masks):
+    """
+    Narrows down many sudokus at once, filling in every square that is the only square in a row, column or box
+    that can be a value, or that can only be one value, until nothing more can be filled in.
+    Works on every sudoku at the same time with numpy, rather than one by one.
+
+    The sudokus are narrowed down CHUNK_SIZE at a time, see narrow_chunk
+
+    Input:
+        masks: (N, 81) numpy array of uint16, one row per sudoku, using the same values as SudokuState.state.
+        Changed in place
+    Output:
+        (N,) numpy array of int8, 1 if the sudoku is now solved, 0 if it needs guessing, -1 if it is unsolvable
+    """
+    status = np.empty(len(masks), dtype=np.int8)
+    for start in range(0, len(masks), CHUNK_SIZE):
+        # Slices are views, so each chunk is changed in place in masks
+        status[start:start + CHUNK_SIZE] = narrow_chunk(masks[start:start + CHUNK_SIZE])
+    return status
+
+
+def narrow_chunk(masks):
+    """
+    Narrows down the sudokus of one chunk at once, the same as narrow_batch. The temporary arrays made are several
+    times the size of masks, so this should only be called with up to CHUNK_SIZE sudokus
+    """
+    status = np.zeros(len(masks), dtype=np.int8)
+
+    # Indexes of the sudokus that are still being narrowed down
+    active = np.arange(len(masks))
+
+    while len(active):
+        current = masks[active]
+        filled = (current & FILLED) != 0
+
+        # The values filled in to each row, column, and box. The sum of the filled in bits is only the same as
+        # the or of them if no value is filled in twice
+        unit_squares = current[:, UNITS_ARRAY]
+        filled_bits = np.where(unit_squares & FILLED, unit_squares & ALL_VALUES, 0)
+        unit_filled = np.bitwise_or.reduce(filled_bits, axis=2)
+        repeated_value = (filled_bits.sum(axis=2, dtype=np.int32) != unit_filled).any(axis=1)
+
+        # Removes the filled in values from the neighbours of every empty square
+        neighbour_filled = np.bitwise_or.reduce(unit_filled[:, SQUARE_UNIT_INDEXES_ARRAY], axis=2)
+        current = np.where(filled, current, current & ~neighbour_filled)
+
+        # Values possible in at least one, and at least two empty squares of every row, column, and box
+        unit_squares = np.where(current[:, UNITS_ARRAY] & FILLED, 0, current[:, UNITS_ARRAY])
+        possible_once = np.zeros(unit_filled.shape, dtype=np.uint16)
+        possible_twice = np.zeros(unit_filled.shape, dtype=np.uint16)
+        for i in range(9):
+            possible_twice |= possible_once & unit_squares[:, :, i]
+            possible_once |= unit_squares[:, :, i]
+
+        # A value that can't go anywhere in a row, column, or box, or an empty square that can't be any value
+        unsolvable = (repeated_value
+                      | ((possible_once | unit_filled) != ALL_VALUES).any(axis=1)
+                      | (~filled & (current == 0)).any(axis=1))
+
+        # Values that can only be in one square of a row, column, or box are filled in to that square.
+        # A square that is the only place for two values makes the sudoku unsolvable
+        single_values = possible_once & ~possible_twice & ~unit_filled
+        hidden_singles = np.bitwise_or.reduce(single_values[:, SQUARE_UNIT_INDEXES_ARRAY], axis=2) & current
+        hidden_singles[filled] = 0
+        unsolvable |= (BIT_COUNT_ARRAY[hidden_singles] > 1).any(axis=1)
+        current = np.where(hidden_singles != 0, hidden_singles, current)
+
+        # Squares that can only be one value are filled in
+        current = np.where(~filled & (BIT_COUNT_ARRAY[current & ALL_VALUES] == 1), current | FILLED, current)
+
+        changed = (current != masks[active]).any(axis=1)
+        solved = (current & FILLED).all(axis=1)
+        masks[active] = current
+
+        # Sudokus that didn't change are finished. Ones that were just filled in go round once more, so
+        # that the last values are checked for repeats
+        status[active[unsolvable]] = -1
+        status[active[~unsolvable & ~changed & solved]] = 1
+        active = active[~unsolvable & changed]
+
+    return status
+
+
+def sudoku_solver_batch(sudoku_puzzles, engine="state", cache=None, max_nodes=None):
+    """
+    Solves many Sudoku puzzles at once.
+
+    Every puzzle is narrowed down at the same time with narrow_batch, and only the puzzles that still need
+    guessing after that are passed one by one to sudoku_solver. The puzzles are worked on CHUNK_SIZE at a time,
+    so apart from the output, the memory used doesn't grow with the number of puzzles.
+
+    Input
+        sudoku_puzzles : Nx9x9 numpy array
+            Empty cells are designated by 0.
+        engine : str
+            The solver that sudoku_solver uses for puzzles that need guessing, see sudoku_solver
+        cache : SolutionCache or DiskSolutionCache
+            If given, every puzzle is looked up in the cache first, and only the rest are solved and then cached
+        max_nodes : int
+            If given, sudoku_solver gives up on a puzzle after searching this many nodes, so that one
+            pathological puzzle can't hold up the rest
+
+    Output
+        Nx9x9 numpy array of int8
+            The solution to each puzzle, with all entries of a puzzle being -1 if it has no solution.
+            A puzzle that was given up on is left as far as it was narrowed down, with 0s for the squares that
+            weren't filled in. Those aren't cached
+    """
+    values = np.asarray(sudoku_puzzles).reshape(-1, 81)
+
+    if cache is not None:
+        cached = cache.get_many(values.reshape(-1, 9, 9))
+        missing = [index for index, solution in enumerate(cached) if solution is None]
+
+        solutions = np.empty((len(values), 9, 9), dtype=np.int8)
+        for index, solution in enumerate(cached):
+            if solution is not None:
+                solutions[index] = solution
+
+        if missing:
+            solutions[missing] = sudoku_solver_batch(values[missing], engine, max_nodes=max_nodes)
+
+            # Puzzles that were given up on still have 0s, and aren't cached
+            finished = [index for index in missing if solutions[index].all()]
+            cache.put_many(values[finished].reshape(-1, 9, 9), solutions[finished])
+
+        return solutions
+
+    solutions = np.empty(values.shape, dtype=np.int8)
+
+    for start in range(0, len(values), CHUNK_SIZE):
+        # int16 so that FILLED fits whatever the type of the input was
+        chunk = values[start:start + CHUNK_SIZE].astype(np.int16)
+        masks = np.where(chunk > 0, FILLED | np.left_shift(1, np.clip(chunk, 1, 9) - 1), ALL_VALUES).astype(np.uint16)
+        status = narrow_chunk(masks)
+
+        chunk_solutions = solutions[start:start + CHUNK_SIZE]
+        chunk_solutions[:] = np.where(masks & FILLED, LOWEST_VALUE_ARRAY[masks & ALL_VALUES], 0)
+        chunk_solutions[status == -1] = -1
+
+        for index in np.flatnonzero(status == 0):
+            try:
+                chunk_solutions[index] = sudoku_solver(chunk_solutions[index].reshape(9, 9), engine,
+                                                       max_nodes=max_nodes).ravel()
+            except SolveLimitExceeded:
+                # Left as it was narrowed down
+                pass
+
+    return solutions.reshape(-1, 9, 9)
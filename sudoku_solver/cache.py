@@ -0,0 +1,289 @@
+"""
+Caches of solutions, in memory and in a sqlite database
+"""
+import collections
+import itertools
+import sqlite3
+import threading
+import time
+
+import numpy as np
+
+from .canonical import apply_transform, canonical_form, symmetry_fingerprint, undo_transform
+from .lineformat import puzzle_to_line
+from .parallel import puzzle_to_record, records_to_puzzles
+
+
+class SolutionCache:
+    """
+    A least recently used cache of solutions, in memory.
+
+    Every solution is stored under its puzzle exactly as it was given, which only takes turning the puzzle into a
+    line to look up. Finding the canonical form of a puzzle (see canonical_form) takes a few milliseconds, longer
+    than solving most puzzles, so solutions are only shared between puzzles that are the same up to symmetry when
+    the solve was slow: if get_or_solve takes at least CANONICAL_SOLVE_TIME seconds to solve a puzzle, its solution
+    is also stored in canonical form. A puzzle that is a relabelled, reordered, or transposed copy of it is then
+    answered by undoing its transform on the cached solution.
+
+    To know which puzzles are worth finding the canonical form of, the symmetry_fingerprint of every puzzle stored
+    in canonical form is kept. A puzzle that isn't cached exactly only has its canonical form found if it has one
+    of those fingerprints. Puzzles with fewer than MIN_CANONICAL_CLUES given values, or too many symmetries for
+    canonical_form to search, are only stored exactly.
+    The canonical forms of recently seen puzzles are kept too, so a repeat doesn't search for it again.
+
+    Safe to share between threads
+    """
+
+    MIN_CANONICAL_CLUES = 17
+
+    # Solves at least this slow also store the solution in canonical form, about twice as long as finding the
+    # canonical form of a hard puzzle takes
+    CANONICAL_SOLVE_TIME = 0.01
+
+    def __init__(self, maxsize=4096):
+        """
+        Input:
+            maxsize: int, the most solutions to keep. The least recently used are thrown away first
+        """
+        self.maxsize = maxsize
+
+        # {key: (solution record, fingerprint)}, with the fingerprint None for solutions stored exactly
+        self.solutions = collections.OrderedDict()
+
+        # {puzzle line: (key, Transform) or None if the canonical form couldn't be found}
+        self.canonical_forms = collections.OrderedDict()
+
+        # {fingerprint: number of solutions stored in canonical form with it}
+        self.fingerprints = collections.Counter()
+
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def canonical_key(self, grid, line):
+        """
+        Returns the (key, Transform) pair a puzzle is stored under in canonical form, or None if it can't be
+        stored in canonical form
+        """
+        if np.count_nonzero(grid) < self.MIN_CANONICAL_CLUES:
+            return None
+
+        with self.lock:
+            if line in self.canonical_forms:
+                self.canonical_forms.move_to_end(line)
+                return self.canonical_forms[line]
+
+        found = canonical_form(grid)
+        with self.lock:
+            self.canonical_forms[line] = found
+            while len(self.canonical_forms) > self.maxsize:
+                self.canonical_forms.popitem(last=False)
+        return found
+
+    def lookup(self, key, transform):
+        """Returns the 9x9 solution stored under a key, undoing the Transform if it isn't None, or None"""
+        with self.lock:
+            entry = self.solutions.get(key)
+            if entry is None:
+                return None
+            self.solutions.move_to_end(key)
+
+        solution = records_to_puzzles(entry[0])[0]
+        return solution if transform is None else undo_transform(solution, transform)
+
+    def store(self, key, transform, solution, fingerprint=None):
+        """Stores the 9x9 solution under a key, applying the Transform to it first if it isn't None"""
+        if transform is not None:
+            solution = apply_transform(solution, transform) if not (np.asarray(solution) == -1).all() else solution
+
+        with self.lock:
+            if key in self.solutions:
+                self.forget_fingerprint(self.solutions.pop(key)[1])
+
+            self.solutions[key] = (puzzle_to_record(solution), fingerprint)
+            if fingerprint is not None:
+                self.fingerprints[fingerprint] += 1
+
+            while len(self.solutions) > self.maxsize:
+                self.forget_fingerprint(self.solutions.popitem(last=False)[1][1])
+
+    def forget_fingerprint(self, fingerprint):
+        """Counts one less solution stored with a fingerprint (None does nothing). Called with the lock held"""
+        if fingerprint is None:
+            return
+
+        self.fingerprints[fingerprint] -= 1
+        if not self.fingerprints[fingerprint]:
+            del self.fingerprints[fingerprint]
+
+    def get(self, sudoku_puzzle):
+        """Returns the cached 9x9 solution of a puzzle, or None if it isn't cached"""
+        grid = np.asarray(sudoku_puzzle).reshape(9, 9)
+        line = puzzle_to_line(grid)
+        solution = self.lookup(line, None)
+
+        if solution is None and self.fingerprints and symmetry_fingerprint(grid) in self.fingerprints:
+            found = self.canonical_key(grid, line)
+            if found is not None:
+                solution = self.lookup(*found)
+
+        with self.lock:
+            if solution is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return solution
+
+    def put(self, sudoku_puzzle, solution):
+        """Caches the 9x9 solution of a puzzle, exactly as it is given"""
+        self.store(puzzle_to_line(np.asarray(sudoku_puzzle).reshape(9, 9)), None, solution)
+
+    def get_many(self, sudoku_puzzles):
+        """Returns a list of the cached 9x9 solution of each puzzle, with None for puzzles that aren't cached"""
+        return [self.get(sudoku_puzzle) for sudoku_puzzle in sudoku_puzzles]
+
+    def put_many(self, sudoku_puzzles, solutions):
+        """Caches the 9x9 solution of each puzzle"""
+        for sudoku_puzzle, solution in zip(sudoku_puzzles, solutions):
+            self.put(sudoku_puzzle, solution)
+
+    def get_or_solve(self, sudoku_puzzle, solve):
+        """
+        Returns the cached solution of a puzzle, or solves it with solve(sudoku_puzzle) and caches the solution.
+        If solving took at least CANONICAL_SOLVE_TIME, the solution is stored in canonical form as well
+        """
+        solution = self.get(sudoku_puzzle)
+        if solution is not None:
+            return solution
+
+        start = time.perf_counter()
+        solution = solve(sudoku_puzzle)
+        solve_time = time.perf_counter() - start
+
+        grid = np.asarray(sudoku_puzzle).reshape(9, 9)
+        line = puzzle_to_line(grid)
+        self.store(line, None, solution)
+
+        if solve_time >= self.CANONICAL_SOLVE_TIME:
+            found = self.canonical_key(grid, line)
+            if found is not None:
+                self.store(*found, solution, symmetry_fingerprint(grid))
+
+        return solution
+
+    def __len__(self):
+        return len(self.solutions)
+
+
+class DiskSolutionCache:
+    """
+    A cache of solutions kept in a sqlite database file, so it lasts between runs.
+
+    Puzzles and solutions are stored as 81 byte records (see puzzle_to_record), keyed by the puzzle exactly as it
+    is given. When there are more than max_entries solutions, the least recently used are deleted.
+    The entry count is kept by this object, so if many processes share one file it can go a little over
+    max_entries until one of them next stores a solution.
+
+    Has the same methods as SolutionCache, so either can be passed to sudoku_solver and the batch solvers.
+    Safe to share between threads, but not between processes (open one per process instead)
+    """
+
+    # The most puzzles looked up in one sqlite query
+    QUERY_SIZE = 500
+
+    def __init__(self, path, max_entries=1000000):
+        """
+        Input:
+            path: str, the database file. Created if it doesn't exist
+            max_entries: int, the most solutions to keep
+        """
+        self.max_entries = max_entries
+        self.lock = threading.Lock()
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+
+        with self.connection:
+            self.connection.execute("CREATE TABLE IF NOT EXISTS solutions "
+                                    "(puzzle BLOB PRIMARY KEY, solution BLOB NOT NULL, last_used INTEGER NOT NULL)")
+            self.connection.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+
+        self.count, last_used = self.connection.execute(
+            "SELECT COUNT(*), COALESCE(MAX(last_used), 0) FROM solutions").fetchone()
+
+        # Goes up by one every time solutions are looked up or stored, to order them by when they were last used
+        self.clock = itertools.count(last_used + 1)
+
+    def get_many(self, sudoku_puzzles):
+        """Returns a list of the cached 9x9 solution of each puzzle, with None for puzzles that aren't cached"""
+        records = [puzzle_to_record(sudoku_puzzle) for sudoku_puzzle in sudoku_puzzles]
+        found = {}
+
+        with self.lock, self.connection:
+            for start in range(0, len(records), self.QUERY_SIZE):
+                query = records[start:start + self.QUERY_SIZE]
+                found.update(self.connection.execute(
+                    "SELECT puzzle, solution FROM solutions WHERE puzzle IN ({})".format(",".join("?" * len(query))),
+                    query))
+
+            if found:
+                now = next(self.clock)
+                self.connection.executemany("UPDATE solutions SET last_used = ? WHERE puzzle = ?",
+                                            ((now, record) for record in found))
+
+        return [records_to_puzzles(found[record])[0] if record in found else None for record in records]
+
+    def put_many(self, sudoku_puzzles, solutions):
+        """
+        Caches the 9x9 solution of each puzzle, deleting the least recently used solutions if there are too many.
+        A puzzle that is already cached is marked as just used, so a solution that keeps being stored isn't the
+        first to be deleted
+        """
+        records = {puzzle_to_record(sudoku_puzzle): puzzle_to_record(solution)
+                   for sudoku_puzzle, solution in zip(sudoku_puzzles, solutions)}
+
+        with self.lock, self.connection:
+            now = next(self.clock)
+
+            # Only puzzles that aren't cached yet add to the count, as an update also counts as a change in sqlite
+            already_cached = 0
+            keys = list(records)
+            for start in range(0, len(keys), self.QUERY_SIZE):
+                query = keys[start:start + self.QUERY_SIZE]
+                already_cached += self.connection.execute(
+                    "SELECT COUNT(*) FROM solutions WHERE puzzle IN ({})".format(",".join("?" * len(query))),
+                    query).fetchone()[0]
+
+            self.connection.executemany(
+                "INSERT INTO solutions (puzzle, solution, last_used) VALUES (?, ?, ?) "
+                "ON CONFLICT(puzzle) DO UPDATE SET last_used = excluded.last_used",
+                ((puzzle, solution, now) for puzzle, solution in records.items()))
+            self.count += len(records) - already_cached
+
+            if self.count > self.max_entries:
+                self.connection.execute(
+                    "DELETE FROM solutions WHERE puzzle IN "
+                    "(SELECT puzzle FROM solutions ORDER BY last_used LIMIT ?)", (self.count - self.max_entries,))
+                self.count = self.max_entries
+
+    def get(self, sudoku_puzzle):
+        """Returns the cached 9x9 solution of a puzzle, or None if it isn't cached"""
+        return self.get_many([sudoku_puzzle])[0]
+
+    def put(self, sudoku_puzzle, solution):
+        """Caches the 9x9 solution of a puzzle"""
+        self.put_many([sudoku_puzzle], [solution])
+
+    def get_or_solve(self, sudoku_puzzle, solve):
+        """Returns the cached solution of a puzzle, or solves it with solve(sudoku_puzzle) and caches the solution"""
+        solution = self.get(sudoku_puzzle)
+        if solution is None:
+            solution = solve(sudoku_puzzle)
+            self.put(sudoku_puzzle, solution)
+        return solution
+
+    def close(self):
+        """Closes the database file"""
+        with self.lock:
+            self.connection.close()
+
+    def __len__(self):
+        return self.count
@@ -0,0 +1,183 @@
+"""
+The canonical form of a sudoku, the same for every sudoku that is a relabelling, reflection, or reordering of rows
+and columns of another
+"""
+import collections
+import itertools
+
+import numpy as np
+
+
+# The ways the rows (or columns) of a sudoku can be reordered without breaking it: the bands of 3 rows can be put in
+# any order, and so can the rows inside each band. Only built the first time canonical_form is called
+LINE_ORDERS = None
+LINE_ORDERS_ARRAY = None
+
+# The most partial transforms canonical_form keeps at once. Puzzles with many symmetries, such as a few full rows
+# and nothing else, can tie on hundreds of thousands of them, and searching them all takes seconds. Puzzles from
+# the benchmark corpora need no more than a few hundred, and the odd generated puzzle a few thousand
+MAX_CANONICAL_STATES = 4096
+
+# A transform of a sudoku, see apply_transform
+Transform = collections.namedtuple("Transform", ["transpose", "row_order", "col_order", "relabel"])
+
+
+def build_line_orders():
+    """Returns a tuple of the 1296 orders of 9 rows that keep a sudoku valid, each a tuple of 9 row indexes"""
+    orders = []
+    for band_order in itertools.permutations(range(3)):
+        for inside_orders in itertools.product(itertools.permutations(range(3)), repeat=3):
+            orders.append(tuple(band * 3 + inside_orders[i][j] for i, band in enumerate(band_order) for j in range(3)))
+    return tuple(orders)
+
+
+def apply_transform(sudoku_puzzle, transform):
+    """
+    Returns a 9x9 numpy array of the sudoku after the transform. The sudoku is transposed if transform.transpose,
+    then row i of the output is row transform.row_order[i] (and the same for columns), then every value v is
+    replaced with transform.relabel[v]. The output has the same dtype as the sudoku
+    """
+    grid = np.asarray(sudoku_puzzle).reshape(9, 9)
+    if transform.transpose:
+        grid = grid.T
+
+    return np.array(transform.relabel, dtype=grid.dtype)[grid[np.ix_(transform.row_order, transform.col_order)]]
+
+
+def undo_transform(sudoku_puzzle, transform):
+    """
+    The opposite of apply_transform, so that undo_transform(apply_transform(sudoku, transform), transform) is sudoku.
+    A grid of all -1 (no solution) is returned as it is
+    """
+    grid = np.asarray(sudoku_puzzle).reshape(9, 9)
+    if (grid == -1).all():
+        return grid.copy()
+
+    original_values = np.argsort(transform.relabel)
+
+    output = np.empty_like(grid)
+    output[np.ix_(transform.row_order, transform.col_order)] = original_values[grid]
+    if transform.transpose:
+        output = output.T
+
+    return output
+
+
+def canonical_form(sudoku_puzzle, max_states=MAX_CANONICAL_STATES):
+    """
+    Finds the canonical form of a sudoku: the same one for every sudoku that is the same up to swapping values,
+    reordering rows inside a band (or columns inside a stack), reordering bands (or stacks), and transposing.
+
+    The canonical form is the smallest grid, read in row major order, that the sudoku can be transformed into,
+    with values relabelled in the order they are first read, so the first value read is always 1.
+    It's found one row at a time, keeping only the partial transforms that give the smallest rows so far.
+
+    Input: 9x9 numpy array, with empty squares as 0, and the most partial transforms to keep at once
+    Output: (str, Transform) pair. The str is the 81 digits of the canonical form, and apply_transform of the
+            sudoku with the Transform gives the canonical form.
+            None if more than max_states partial transforms tie, as the search would take too long
+    """
+    global LINE_ORDERS, LINE_ORDERS_ARRAY
+    if LINE_ORDERS is None:
+        LINE_ORDERS = build_line_orders()
+        LINE_ORDERS_ARRAY = np.array(LINE_ORDERS, dtype=np.intp)
+
+    grid = np.asarray(sudoku_puzzle).reshape(9, 9).astype(int)
+    grids = (grid.tolist(), grid.T.tolist())
+
+    # The first row only depends on which squares are empty, as the values are always labelled 1, 2, 3 and so on.
+    # The smallest first row has its empty squares as early as possible, so each (transpose, row, column order)
+    # is scored by reading the filled in squares as bits of a binary number, and the smallest are kept
+    filled = np.array([grid != 0, grid.T != 0])
+    scores = (filled[:, :, LINE_ORDERS_ARRAY] * (1 << np.arange(8, -1, -1))).sum(axis=3)
+    best = np.argwhere(scores == scores.min())
+    if len(best) > max_states:
+        return None
+
+    # Partial transforms as (transpose, rows so far, column order, relabel list, next label)
+    states = []
+    for transpose, first_row, col_order_index in best.tolist():
+        col_order = LINE_ORDERS[col_order_index]
+        relabel = [0] * 10
+        next_label = 1
+        for col in col_order:
+            value = grids[transpose][first_row][col]
+            if value:
+                relabel[value] = next_label
+                next_label += 1
+        states.append((transpose, (first_row,), col_order, relabel, next_label))
+
+    transpose, rows, col_order, relabel, next_label = states[0]
+    canonical = [[relabel[grids[transpose][rows[0]][col]] for col in col_order]]
+
+    for row_number in range(1, 9):
+        best_row = None
+        next_states = []
+
+        for transpose, rows, col_order, relabel, next_label in states:
+            if row_number % 3 == 0:
+                # Any row from a band that hasn't been used yet
+                used_bands = {row // 3 for row in rows}
+                next_rows = [row for row in range(9) if row // 3 not in used_bands]
+            else:
+                # The rest of the rows in the current band
+                band = rows[-1] // 3
+                next_rows = [row for row in range(band * 3, band * 3 + 3) if row not in rows]
+
+            for next_row in next_rows:
+                row_values = grids[transpose][next_row]
+                new_relabel = relabel
+                new_next_label = next_label
+                output_row = []
+
+                for col in col_order:
+                    value = row_values[col]
+                    if value and not new_relabel[value]:
+                        if new_relabel is relabel:
+                            new_relabel = relabel[:]
+                        new_relabel[value] = new_next_label
+                        new_next_label += 1
+                    output_row.append(new_relabel[value])
+
+                    # Stops reading the row as soon as it's bigger than the best row
+                    if best_row is not None and output_row > best_row[:len(output_row)]:
+                        break
+                else:
+                    if best_row is None or output_row < best_row:
+                        best_row = output_row
+                        next_states = []
+                    next_states.append((transpose, rows + (next_row,), col_order, new_relabel, new_next_label))
+                    if len(next_states) > max_states:
+                        return None
+
+        canonical.append(best_row)
+        states = next_states
+
+    transpose, row_order, col_order, relabel, next_label = states[0]
+
+    # Values that aren't in the sudoku are given the labels left over, in order, so that relabel is a permutation
+    for value in range(1, 10):
+        if not relabel[value]:
+            relabel[value] = next_label
+            next_label += 1
+
+    canonical_string = "".join(str(value) for row in canonical for value in row)
+    return canonical_string, Transform(bool(transpose), row_order, col_order, tuple(relabel))
+
+
+def symmetry_fingerprint(sudoku_puzzle):
+    """
+    Returns a value that is the same for every transform of a sudoku (see canonical_form), and takes far less time
+    to find than the canonical form. Sudokus with different fingerprints can't be transforms of each other, but
+    sudokus with the same fingerprint may not be either.
+
+    The fingerprint is the number of given values in each row and column, grouped into bands and stacks and sorted
+    so that the order doesn't matter, and the sorted number of times each value is given
+    """
+    grid = np.asarray(sudoku_puzzle).reshape(9, 9)
+    filled = grid != 0
+
+    lines = tuple(sorted(tuple(sorted(tuple(sorted(band)) for band in counts.reshape(3, 3).tolist()))
+                         for counts in (filled.sum(axis=1), filled.sum(axis=0))))
+
+    return lines, tuple(sorted(np.bincount(grid[filled], minlength=10)[1:].tolist()))
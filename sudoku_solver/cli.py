@@ -0,0 +1,49 @@
+"""
+The command line interface, run with python -m sudoku_solver
+"""
+import argparse
+import sys
+
+from .lineformat import solve_fixed_width_file, solve_lines
+from .solver import ENGINES
+
+
+def main(argv=None):
+    """
+    Command line entry point. Solves a file of puzzles in the one line format, and writes the solutions in the
+    same format, one per line
+    """
+    parser = argparse.ArgumentParser(description="Solves 9x9 sudokus written one per line, with . or 0 for blanks")
+    parser.add_argument("input", nargs="?", default="-", help="file of puzzles, or - for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="file to write solutions to, or - for stdout (default)")
+    parser.add_argument("-e", "--engine", default="state", choices=sorted(ENGINES), help="solver to use")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of processes to solve with, 0 for one per CPU (default 1)")
+    parser.add_argument("-b", "--batch-size", type=int, default=1024, help="puzzles solved at a time (default 1024)")
+    parser.add_argument("--fixed-width", action="store_true",
+                        help="memory map the input and output files, which must have lines of exactly 82 bytes")
+    args = parser.parse_args(argv)
+
+    if args.fixed_width:
+        if args.input == "-" or args.output == "-":
+            parser.error("--fixed-width needs an input and output file")
+        try:
+            solve_fixed_width_file(args.input, args.output, args.batch_size, args.engine)
+        except ValueError as error:
+            parser.error(str(error))
+        return
+
+    input_file = sys.stdin if args.input == "-" else open(args.input)
+    output_file = sys.stdout if args.output == "-" else open(args.output, "w")
+
+    try:
+        for line in solve_lines(input_file, args.batch_size, args.workers or None, args.engine):
+            output_file.write(line + "\n")
+    except ValueError as error:
+        # The solutions of every puzzle before the bad line have been written
+        parser.error(str(error))
+    finally:
+        if input_file is not sys.stdin:
+            input_file.close()
+        if output_file is not sys.stdout:
+            output_file.close()
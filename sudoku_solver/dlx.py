@@ -0,0 +1,300 @@
+"""
+DancingLinksSolver, which solves a sudoku as an exact cover problem with Algorithm X and Dancing Links
+"""
+import time
+
+from .state import values_to_numpy
+from .tables import POSITIONS
+
+
+# The links of an empty exact cover matrix for a 9x9 sudoku, see DancingLinksSolver.
+# Only built the first time a DancingLinksSolver is made, then copied by every solver after that
+DANCING_LINKS_MATRIX = None
+
+
+def build_dancing_links_matrix():
+    """
+    Builds the links of the exact cover matrix of an empty 9x9 sudoku
+
+    Node 0 is the root, nodes 1 to 324 are the column headers, and every (square, value) pair after that is a row of
+    4 nodes, one for each column it covers. The 4 columns that the pair (square, value) covers are
+        1 + square                      the square has a value
+        82 + row * 9 + value - 1        the row has the value
+        163 + col * 9 + value - 1       the column has the value
+        244 + box * 9 + value - 1       the box has the value
+
+    Output:
+        tuple of lists (left, right, up, down, column, candidate, size), each indexed by node number.
+        column is the header of the column a node is in, candidate is square * 9 + value - 1 for the row a node is
+        in, and size is the number of nodes in each column
+    """
+    headers = 324
+    left = list(range(-1, headers))
+    right = list(range(1, headers + 2))
+    left[0] = headers
+    right[headers] = 0
+    up = list(range(headers + 1))
+    down = list(range(headers + 1))
+    column = list(range(headers + 1))
+    candidate = [-1] * (headers + 1)
+    size = [0] * (headers + 1)
+
+    for square, (row, col) in enumerate(POSITIONS):
+        box = row - row % 3 + col // 3
+        for value in range(1, 10):
+            first_node = len(left)
+            columns = (1 + square, 82 + row * 9 + value - 1, 163 + col * 9 + value - 1, 244 + box * 9 + value - 1)
+
+            for i, header in enumerate(columns):
+                node = first_node + i
+
+                # Links the node into the row
+                left.append(first_node + (i - 1) % 4)
+                right.append(first_node + (i + 1) % 4)
+
+                # Links the node into the bottom of the column
+                up.append(up[header])
+                down.append(header)
+                down[up[header]] = node
+                up[header] = node
+
+                column.append(header)
+                candidate.append(square * 9 + value - 1)
+                size[header] += 1
+
+    return left, right, up, down, column, candidate, size
+
+
+class DancingLinksSolver:
+    """
+    Solves a sudoku as an exact cover problem, with Knuth's Algorithm X and dancing links
+
+    Every (square, value) pair is a row of the matrix, and a solution is a set of 81 rows that covers each
+    of the 324 columns exactly once (see build_dancing_links_matrix).
+    The links between nodes are kept in flat lists of ints indexed by node number, rather than as a object per node.
+
+    Has the same get_solved_numpy and get_solved_values methods as SudokuState, so it can be used in its place
+    by sudoku_solver
+    """
+
+    __slots__ = ("left", "right", "up", "down", "column", "candidate", "size", "solution", "unsolvable", "stats",
+                 "limits")
+
+    def __init__(self, state):
+        """
+        Input is a 9x9 numpy array of ints, with emtpy cells being
+        zeros
+
+        Every given value has its row of the matrix chosen straight away
+        """
+        global DANCING_LINKS_MATRIX
+        if DANCING_LINKS_MATRIX is None:
+            DANCING_LINKS_MATRIX = build_dancing_links_matrix()
+
+        self.left, self.right, self.up, self.down, self.column, self.candidate, self.size = (
+            links[:] for links in DANCING_LINKS_MATRIX)
+
+        # The value of every square, 0 if the value isn't known yet
+        self.solution = [int(num) for row in state for num in row]
+
+        # Set to True if the given values break the rules of sudoku
+        self.unsolvable = False
+
+        # A SolveStats to count nodes, guesses and backtracks in, or None
+        self.stats = None
+
+        # A SolveLimits that search gives up at, by raising SolveLimitExceeded, or None
+        self.limits = None
+
+        for square, value in enumerate(self.solution):
+            if value <= 0:
+                self.solution[square] = 0
+                continue
+
+            # The first node of the row for (square, value), and the column of the square comes first
+            node = 325 + (square * 9 + value - 1) * 4
+
+            # If any column of this row is already covered, then another given value is in the same row,
+            # column, or box, or square
+            if not self.choose_row(node):
+                self.unsolvable = True
+                break
+
+    def choose_row(self, node):
+        """
+        Covers every column of the row that node is in, if none of them have been covered already
+
+        Returns True if the row was chosen, False otherwise
+        """
+        right = self.right
+        left = self.left
+        column = self.column
+
+        j = node
+        while True:
+            header = column[j]
+            if right[left[header]] != header:
+                return False
+            j = right[j]
+            if j == node:
+                break
+
+        j = node
+        while True:
+            self.cover(column[j])
+            j = right[j]
+            if j == node:
+                return True
+
+    def cover(self, header):
+        """Removes a column from the header list, and every row in the column from the other columns they are in"""
+        left = self.left
+        right = self.right
+        up = self.up
+        down = self.down
+        column = self.column
+        size = self.size
+
+        right[left[header]] = right[header]
+        left[right[header]] = left[header]
+
+        i = down[header]
+        while i != header:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def uncover(self, header):
+        """Puts back a column removed by cover. Columns must be uncovered in the opposite order they were covered"""
+        left = self.left
+        right = self.right
+        up = self.up
+        down = self.down
+        column = self.column
+        size = self.size
+
+        i = up[header]
+        while i != header:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+
+        right[left[header]] = header
+        left[right[header]] = header
+
+    def search(self):
+        """
+        Recursively chooses rows until every column is covered.
+        Fills in self.solution with the chosen rows
+
+        Returns True if a solution was found, False otherwise
+        Raises SolveLimitExceeded if self.limits is reached
+        """
+        if self.limits is not None:
+            self.limits.count_node()
+
+        right = self.right
+        down = self.down
+        size = self.size
+        stats = self.stats
+
+        if stats is not None:
+            stats.nodes += 1
+
+        if right[0] == 0:
+            # Every column is covered
+            return True
+
+        # Choose the column with the fewest rows left in it
+        header = right[0]
+        best_header = header
+        best_size = size[header]
+        while header != 0:
+            if size[header] < best_size:
+                best_header = header
+                best_size = size[header]
+                if best_size <= 1:
+                    break
+            header = right[header]
+
+        if best_size == 0:
+            return False
+
+        self.cover(best_header)
+
+        if stats is not None and best_size > 1:
+            stats.depth += 1
+            stats.max_depth = max(stats.max_depth, stats.depth)
+
+        node = down[best_header]
+        while node != best_header:
+            if stats is not None and best_size > 1:
+                stats.guesses += 1
+
+            j = right[node]
+            while j != node:
+                self.cover(self.column[j])
+                j = right[j]
+
+            if self.search():
+                square, value = divmod(self.candidate[node], 9)
+                self.solution[square] = value + 1
+                return True
+
+            if stats is not None and best_size > 1:
+                stats.backtracks += 1
+
+            j = self.left[node]
+            while j != node:
+                self.uncover(self.column[j])
+                j = self.left[j]
+
+            node = down[node]
+
+        if stats is not None and best_size > 1:
+            stats.depth -= 1
+
+        self.uncover(best_header)
+        return False
+
+    def solve(self):
+        """
+        Fills in self.solution if it can. The matrix is left as it was when the solution was found, so this
+        should only be called once
+
+        Returns 1 if the sudoku was solved
+        Returns -1 if the sudoku was unsolvable
+        """
+        if self.unsolvable or not self.search():
+            return -1
+        return 1
+
+    def get_solved_values(self):
+        """
+        Solves the sudoku. Returns the solution as a flat list of 81 ints in row major order.
+        If the sudoku is unsolvable, then all values will be -1
+        """
+        start = time.perf_counter()
+        outcome = self.solve()
+        if self.stats is not None:
+            self.stats.total_time += time.perf_counter() - start
+
+        if outcome == -1:
+            return [-1] * 81
+
+        return self.solution[:]
+
+    def get_solved_numpy(self):
+        """
+        Solves the sudoku. Returns a 9X9 int8 numpy array of the solved sudoku.
+        If the sudoku is unsolvable, then all values will be -1
+        """
+        return values_to_numpy(self.get_solved_values())
@@ -0,0 +1,166 @@
+"""
+Making random puzzles with unique solutions
+"""
+from concurrent.futures import ProcessPoolExecutor
+import collections
+import itertools
+import os
+import random
+
+import numpy as np
+
+from .parallel import puzzle_to_record, records_to_puzzles
+from .state import SudokuState
+from .tables import FILLED, MASK_VALUES, POSITIONS
+
+
+def random_solution(rng):
+    """
+    Returns a random solved sudoku as a 9x9 numpy array. Random values are filled into random empty squares, with
+    everything that follows from each one filled in by SudokuState.propagate. A value that turns out to be
+    impossible is rolled back and removed from its square, and if that leaves the square with no possible values
+    the grid is started again
+
+    Input: random.Random to pick the squares and values with
+    """
+    while True:
+        state = SudokuState(np.zeros((9, 9), dtype=int))
+
+        while not state.is_solved():
+            square = rng.choice([square for square, value in enumerate(state.state) if not value & FILLED])
+            value = rng.choice(MASK_VALUES[state.state[square]])
+
+            checkpoint = len(state.trail)
+            if state.fill_in_square(POSITIONS[square], value) == -1:
+                state.undo(checkpoint)
+                state.remove_value(POSITIONS[square], value)
+                if state.analise_empty_value(POSITIONS[square]) == -1:
+                    break
+
+        else:
+            return state.get_numpy_state()
+
+
+def remove_clues(solution, rng, target_clues=0):
+    """
+    Removes clues from a solved sudoku in a random order, skipping any clue that would make the solution not
+    unique, until only target_clues are left or no more can be removed. With the default target_clues of 0 the
+    puzzle is minimal, every clue left is needed for the solution to be unique.
+
+    A clue can be removed if the puzzle has no solution with any other value in its square, which is checked by
+    looking for one solution (see SudokuState.count_solutions) rather than counting two
+
+    Input: 9x9 numpy array of the solution, random.Random to pick the order with, and the number of clues to stop at
+    Output: 9x9 numpy array of the puzzle, with 0 for empty squares
+    """
+    # Kept as a list of rows, which SudokuState reads faster than a numpy array
+    puzzle = np.asarray(solution).tolist()
+
+    squares = list(range(81))
+    rng.shuffle(squares)
+
+    clues = 81
+    for square in squares:
+        if clues <= target_clues:
+            break
+
+        row, col = POSITIONS[square]
+        value = puzzle[row][col]
+        puzzle[row][col] = 0
+
+        # Most of these searches end quickly, and are faster with singles alone
+        state = SudokuState(puzzle, techniques=())
+        state.remove_value((row, col), value)
+        if state.analise_empty_value((row, col)) == -1 or state.count_solutions(1) == 0:
+            clues -= 1
+        else:
+            puzzle[row][col] = value
+
+    return np.array(puzzle)
+
+
+def generate_puzzle(rng=None, target_clues=0):
+    """
+    Makes a random puzzle with a unique solution, see random_solution and remove_clues
+
+    Input: random.Random, or None to use a new one, and the number of clues to stop removing clues at
+    Output: (puzzle, solution) pair of 9x9 numpy arrays
+    """
+    if rng is None:
+        rng = random.Random()
+
+    solution = random_solution(rng)
+    return remove_clues(solution, rng, target_clues), solution
+
+
+def puzzle_random(seed, index):
+    """Returns the random.Random that puzzle number index of generate_puzzles is made with"""
+    return random.Random("{}:{}".format(seed, index))
+
+
+def generate_records(seed, start, count, target_clues=0):
+    """
+    Makes count puzzles, starting at puzzle number start of generate_puzzles, and returns them as bytes of a puzzle
+    record then a solution record for each (see puzzle_to_record). Run by the worker processes of generate_puzzles
+    """
+    records = []
+    for index in range(start, start + count):
+        puzzle, solution = generate_puzzle(puzzle_random(seed, index), target_clues)
+        records.append(puzzle_to_record(puzzle))
+        records.append(puzzle_to_record(solution))
+    return b"".join(records)
+
+
+def generate_puzzles(count=None, seed=None, target_clues=0, workers=1, chunksize=16):
+    """
+    Makes random puzzles with unique solutions. A generator, so puzzles are made as they are needed.
+    Every puzzle is made with its own random.Random seeded from seed and its index, so the same seed gives the
+    same puzzles however many workers are used
+
+    Input
+        count : int
+            The number of puzzles to make, or None to keep making them forever
+        seed : int or str
+            The seed to make the puzzles from, or None for a random seed
+        target_clues : int
+            Clues stop being removed when this many are left. With the default of 0 every puzzle is minimal
+        workers : int
+            The number of worker processes, or None for one per CPU. With 1, puzzles are made in this process
+        chunksize : int
+            The number of puzzles a worker makes at a time
+
+    Output
+        Yields (puzzle, solution) pairs of 9x9 numpy arrays, in order
+    """
+    if seed is None:
+        seed = random.randrange(1 << 64)
+
+    if workers == 1:
+        for index in itertools.count() if count is None else range(count):
+            yield generate_puzzle(puzzle_random(seed, index), target_clues)
+        return
+
+    workers = workers or os.cpu_count() or 1
+
+    # The most chunks being made at once
+    max_pending = workers * 2
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    def collect(future):
+        """Returns the (puzzle, solution) pairs made by a worker, waiting for it if needed"""
+        puzzles = records_to_puzzles(future.result())
+        return zip(puzzles[0::2], puzzles[1::2])
+
+    try:
+        pending = collections.deque()
+        for start in itertools.count(0, chunksize) if count is None else range(0, count, chunksize):
+            size = chunksize if count is None else min(chunksize, count - start)
+            pending.append(executor.submit(generate_records, seed, start, size, target_clues))
+            if len(pending) >= max_pending:
+                yield from collect(pending.popleft())
+
+        while pending:
+            yield from collect(pending.popleft())
+    finally:
+        executor.shutdown(cancel_futures=True)
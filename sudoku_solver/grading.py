@@ -0,0 +1,81 @@
+"""
+Grading how hard a sudoku is for a person, by the techniques needed to solve it
+"""
+import collections
+
+from .state import SudokuState, get_techniques
+
+
+# The techniques a person might use to solve a sudoku, after singles, from the easiest to the hardest.
+# Each is (name, SudokuState method, arguments to the method)
+GRADING_TECHNIQUES = get_techniques(("locked candidates", "naked pair", "hidden pair", "naked triple", "hidden triple",
+                                     "x-wing", "swordfish", "simple colouring"))
+
+# How hard each technique is, used as the score of a puzzle that needs it. "single" is filling in naked and hidden
+# singles, and "guess" is needed when none of GRADING_TECHNIQUES get any further
+TECHNIQUE_DIFFICULTY = {
+    "single": 1.0,
+    "locked candidates": 2.0,
+    "naked pair": 3.0,
+    "hidden pair": 3.5,
+    "naked triple": 4.0,
+    "hidden triple": 4.5,
+    "x-wing": 5.0,
+    "swordfish": 6.0,
+    "simple colouring": 7.0,
+    "guess": 10.0,
+}
+
+# The grade of a puzzle, see grade_puzzle
+Grade = collections.namedtuple("Grade", ["technique", "score", "steps"])
+
+
+def grade_puzzle(sudoku_puzzle):
+    """
+    Grades how hard a sudoku is for a person, by solving it the way a person would. Singles are filled in until
+    there are none left, then the easiest technique in GRADING_TECHNIQUES that removes any values is used, and
+    singles are filled in again, until it's solved or no technique gets any further.
+    The puzzle should have a unique solution, puzzles with more than one solution are graded as needing a guess
+
+    Input
+        sudoku_puzzle : 9x9 numpy array, empty cells are 0
+    Output
+        Grade of
+            technique : str, the hardest technique needed (see TECHNIQUE_DIFFICULTY), or None if the puzzle has
+                        no solution
+            score : float, the difficulty of that technique, or -1 if the puzzle has no solution
+            steps : dict of {technique: number of times it was needed}, not counting singles
+    """
+    # narrow only fills in singles, the techniques are used one at a time below
+    state = SudokuState(sudoku_puzzle, techniques=())
+    if state.check() == -1 or state.narrow() == -1:
+        return Grade(None, -1, {})
+
+    hardest = "single"
+    steps = collections.Counter()
+
+    while not state.is_solved():
+        for name, technique, arguments in GRADING_TECHNIQUES:
+            outcome = technique(state, *arguments)
+            if outcome != 0:
+                break
+        else:
+            # The techniques don't find every contradiction, so a search is needed to tell a puzzle with no solution
+            # from one that needs a guess
+            if state.count_solutions(1) == 0:
+                return Grade(None, -1, dict(steps))
+
+            name = "guess"
+            outcome = 0
+
+        if outcome == -1:
+            return Grade(None, -1, dict(steps))
+
+        steps[name] += 1
+        if TECHNIQUE_DIFFICULTY[name] > TECHNIQUE_DIFFICULTY[hardest]:
+            hardest = name
+
+        if name == "guess":
+            break
+
+    return Grade(hardest, TECHNIQUE_DIFFICULTY[hardest], dict(steps))
@@ -0,0 +1,65 @@
+"""
+Limits on how much work solving a sudoku can take, see SolveLimits
+"""
+import time
+
+
+class SolveLimitExceeded(Exception):
+    """
+    Raised when a solver gives up because it ran into one of its SolveLimits. This is not the same as the sudoku
+    being unsolvable, which is still returned as a solution of all -1s
+
+    Attributes:
+        reason: str, "nodes" if max_nodes was reached, "deadline" if the deadline passed, or "cancelled" if the
+                cancellation token was set
+        nodes: int, the number of nodes searched before giving up
+    """
+
+    def __init__(self, reason, nodes):
+        super().__init__("Gave up solving after {} nodes: {}".format(nodes, reason))
+        self.reason = reason
+        self.nodes = nodes
+
+
+class SolveLimits:
+    """
+    The most work a solver may do before it gives up, by raising SolveLimitExceeded.
+    Set as the limits attribute of SudokuState or DancingLinksSolver, see sudoku_solver(..., max_nodes=...).
+
+    The limits are checked at every node of the search, and by SudokuState every time round the propagation loop,
+    so a solve stops soon after a limit is reached. Checking them is a few attribute lookups, and a call to
+    time.monotonic if there is a deadline. A solver that has given up is left half way through, and shouldn't be
+    used again
+
+    Attributes:
+        max_nodes: int, the most nodes (calls to SudokuState.solve or DancingLinksSolver.search) to search,
+                   or None for no limit
+        deadline: float, the time.monotonic() time to give up at, or None for no limit
+        cancel: a cancellation token, any object with an is_set method such as threading.Event or
+                multiprocessing.Event. Solving gives up once it's set. None to not check for cancellation
+        nodes: int, the number of nodes searched so far
+    """
+
+    __slots__ = ("max_nodes", "deadline", "cancel", "nodes")
+
+    def __init__(self, max_nodes=None, deadline=None, cancel=None):
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.cancel = cancel
+        self.nodes = 0
+
+    def count_node(self):
+        """Checks the limits before a new node of the search, then counts it"""
+        if self.max_nodes is not None and self.nodes >= self.max_nodes:
+            raise SolveLimitExceeded("nodes", self.nodes)
+
+        self.check()
+        self.nodes += 1
+
+    def check(self):
+        """Raises SolveLimitExceeded if the deadline has passed or the cancellation token is set"""
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            raise SolveLimitExceeded("deadline", self.nodes)
+
+        if self.cancel is not None and self.cancel.is_set():
+            raise SolveLimitExceeded("cancelled", self.nodes)
@@ -0,0 +1,149 @@
+"""
+Reading and writing puzzles in the one line format, and solving files of them
+"""
+import itertools
+import os
+
+import numpy as np
+
+from .batch import sudoku_solver_batch
+from .parallel import solve_many
+from .tables import LINE_CHARACTERS
+
+
+def line_to_puzzle(line):
+    """
+    Turns a puzzle in the one line format, 81 characters in row major order with "." or "0" for empty squares,
+    into a 9x9 numpy array of int8
+
+    Raises ValueError if the line isn't a puzzle
+    """
+    codes = np.frombuffer(line.strip().encode("ascii", "replace"), dtype=np.uint8)
+
+    if len(codes) != 81:
+        raise ValueError("Not a puzzle line: {!r}".format(line))
+
+    try:
+        return codes_to_puzzles(codes.reshape(1, 81))[0]
+    except ValueError:
+        raise ValueError("Not a puzzle line: {!r}".format(line)) from None
+
+
+def puzzle_to_line(sudoku_puzzle):
+    """
+    Turns a 9x9 numpy array into the one line format (see line_to_puzzle). Empty squares are written as ".",
+    and a solution of all -1 (no solution) is written as 81 "-"s
+    """
+    return "".join(LINE_CHARACTERS[value + 1] for value in np.asarray(sudoku_puzzle).ravel())
+
+
+def codes_to_puzzles(codes, first_line=1):
+    """
+    Turns a (N, 81) numpy array of the ascii codes of puzzle lines into a Nx9x9 numpy array of int8
+
+    Raises ValueError if any line isn't a puzzle. first_line is the line number of codes[0] in the error message
+    """
+    values = np.where(codes == ord("."), 0, codes.astype(np.int16) - ord("0"))
+
+    bad_lines = np.flatnonzero(((values < 0) | (values > 9)).any(axis=1))
+    if len(bad_lines):
+        raise ValueError("Line {} is not a puzzle line".format(bad_lines[0] + first_line))
+
+    return values.astype(np.int8).reshape(-1, 9, 9)
+
+
+def read_puzzles(lines):
+    """
+    Yields a 9x9 numpy array for every puzzle line in lines, which can be a open file. Blank lines are skipped
+
+    Raises ValueError, with the line number counting from 1, if a line isn't a puzzle
+    """
+    for line_number, line in enumerate(lines, 1):
+        if line.strip():
+            try:
+                yield line_to_puzzle(line)
+            except ValueError:
+                raise ValueError("Line {} is not a puzzle line: {!r}".format(line_number, line.strip())) from None
+
+
+def solve_lines(lines, batch_size=1024, workers=1, engine="state"):
+    """
+    Solves puzzles in the one line format, lazily, so only batch_size puzzles are held at once however many
+    lines there are
+
+    Input
+        lines : iterable of str, such as a open file, with one puzzle per line
+        batch_size : int
+            The number of puzzles solved together by sudoku_solver_batch
+        workers : int
+            If not 1, puzzles are solved across this many processes with solve_many (None for one per CPU)
+        engine : str
+            The solver to use, see sudoku_solver
+
+    Output
+        Yields the solution to each puzzle as a line (see puzzle_to_line), without a newline, in the same order
+    """
+    puzzles = read_puzzles(lines)
+
+    if workers == 1:
+        batches = iter(lambda: list(itertools.islice(puzzles, batch_size)), [])
+        solutions = itertools.chain.from_iterable(sudoku_solver_batch(np.array(batch), engine) for batch in batches)
+    else:
+        solutions = solve_many(puzzles, workers, chunksize=batch_size, engine=engine)
+
+    for solution in solutions:
+        yield puzzle_to_line(solution)
+
+
+# The ascii code written to a puzzle line for each value of a square, indexed by value + 1
+LINE_CHARACTER_CODES = np.frombuffer(LINE_CHARACTERS.encode("ascii"), dtype=np.uint8)
+
+# The length of a line in fixed width puzzle files, 81 squares and a newline
+FIXED_WIDTH_LINE_LENGTH = 82
+
+
+def solve_fixed_width_file(input_path, output_path, batch_size=4096, engine="state"):
+    """
+    Solves a file of puzzles in the one line format where every line is exactly 82 bytes long (81 squares and
+    "\\n"), and writes the solutions to output_path in the same format.
+
+    Both files are memory mapped with numpy. The puzzles are read as slices of a (N, 82) view of the input file,
+    and the solutions are written straight into a view of the output file, which is made the same size as the
+    input before solving. Nothing is parsed line by line.
+
+    Input
+        input_path, output_path : str
+        batch_size : int
+            The number of puzzles solved together by sudoku_solver_batch
+        engine : str
+            The solver to use, see sudoku_solver
+
+    Output
+        int, the number of puzzles solved
+
+    Raises ValueError if the input file is not made of 82 byte puzzle lines
+    """
+    size = os.path.getsize(input_path)
+    if size % FIXED_WIDTH_LINE_LENGTH:
+        raise ValueError("{} is not made of {} byte lines".format(input_path, FIXED_WIDTH_LINE_LENGTH))
+
+    count = size // FIXED_WIDTH_LINE_LENGTH
+    if count == 0:
+        open(output_path, "wb").close()
+        return 0
+
+    puzzles = np.memmap(input_path, dtype=np.uint8, mode="r", shape=(count, FIXED_WIDTH_LINE_LENGTH))
+    if (puzzles[:, 81] != ord("\n")).any():
+        raise ValueError("{} is not made of {} byte lines".format(input_path, FIXED_WIDTH_LINE_LENGTH))
+
+    # Creates the output file at its full size before anything is solved
+    solutions = np.memmap(output_path, dtype=np.uint8, mode="w+", shape=(count, FIXED_WIDTH_LINE_LENGTH))
+
+    for start in range(0, count, batch_size):
+        batch = sudoku_solver_batch(codes_to_puzzles(puzzles[start:start + batch_size, :81], start + 1), engine)
+        solutions[start:start + batch_size, :81] = LINE_CHARACTER_CODES[batch.reshape(-1, 81) + 1]
+
+    solutions[:, 81] = ord("\n")
+    solutions.flush()
+
+    return count
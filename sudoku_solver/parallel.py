@@ -0,0 +1,141 @@
+"""
+Solving puzzles across many processes
+"""
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+import collections
+import itertools
+import os
+
+import numpy as np
+
+from .batch import sudoku_solver_batch
+
+
+def puzzle_to_record(sudoku_puzzle):
+    """
+    Packs a 9x9 sudoku into a record of 81 bytes, one signed byte per square in row major order.
+    Used to send puzzles and solutions between processes without pickling numpy arrays
+    """
+    return np.asarray(sudoku_puzzle, dtype=np.int8).tobytes()
+
+
+def records_to_puzzles(records):
+    """
+    Unpacks bytes of one or more 81 byte records (see puzzle_to_record) into a Nx9x9 numpy array of int8.
+    The array is copied out of the bytes, so that it can be changed
+    """
+    return np.frombuffer(records, dtype=np.int8).reshape(-1, 9, 9).copy()
+
+
+def chunk_puzzles(sudoku_puzzles, chunksize):
+    """
+    Groups puzzles into lists of chunksize puzzles
+
+    Input: iterable of 9x9 numpy arrays, and the number of puzzles per chunk
+    Output: yields (index of the first puzzle in the chunk, list of the puzzles in the chunk) pairs
+    """
+    puzzles = iter(sudoku_puzzles)
+    for start in itertools.count(0, chunksize):
+        chunk = list(itertools.islice(puzzles, chunksize))
+        if not chunk:
+            return
+        yield start, chunk
+
+
+def solve_records(records, engine="state", max_nodes=None):
+    """
+    Solves every puzzle in bytes of 81 byte records with sudoku_solver_batch, and returns the solutions as
+    records in the same order. Run by the worker processes of solve_many and the solving server
+    """
+    return sudoku_solver_batch(records_to_puzzles(records), engine, max_nodes=max_nodes).tobytes()
+
+
+def solve_many(sudoku_puzzles, workers=None, chunksize=64, ordered=True, engine="state", cache=None):
+    """
+    Solves puzzles across many processes. A generator, so puzzles are read from sudoku_puzzles as they are needed,
+    and only a few chunks per worker are waiting at any time.
+
+    Input
+        sudoku_puzzles : iterable of 9x9 numpy arrays
+            Empty cells are designated by 0.
+        workers : int
+            The number of worker processes. Defaults to the number of CPUs
+        chunksize : int
+            The number of puzzles sent to a worker at a time, as one bytes object of 81 byte records
+        ordered : bool
+            If True, the solutions are yielded in the same order as the puzzles. If False, they are yielded as
+            soon as they are solved, along with the index of the puzzle
+        engine : str
+            The solver to use, see sudoku_solver
+        cache : SolutionCache or DiskSolutionCache
+            If given, each chunk is looked up in the cache by this process first, and only the puzzles that
+            aren't cached are sent to the workers. New solutions are stored in the cache
+
+    Output
+        Yields 9x9 numpy arrays of integers, or (index, 9x9 numpy array) pairs if ordered is False.
+        Each array is the solution, or all -1 if the puzzle has no solution
+    """
+    workers = workers or os.cpu_count() or 1
+
+    # The most chunks waiting to be solved at once
+    max_pending = workers * 2
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+
+    def submit(chunk):
+        """
+        Sends the puzzles of a chunk that aren't cached to a worker.
+        Returns (chunk, cached solutions with None for each puzzle that wasn't cached, future or None)
+        """
+        cached = cache.get_many(chunk) if cache is not None else [None] * len(chunk)
+        records = b"".join(puzzle_to_record(puzzle) for puzzle, solution in zip(chunk, cached) if solution is None)
+        return chunk, cached, executor.submit(solve_records, records, engine) if records else None
+
+    def collect(chunk, cached, future):
+        """Returns the list of solutions of a chunk from submit, waiting for its worker if needed"""
+        if future is None:
+            return cached
+
+        solved = records_to_puzzles(future.result())
+        if cache is not None:
+            cache.put_many([puzzle for puzzle, solution in zip(chunk, cached) if solution is None], solved)
+
+        solved = iter(solved)
+        return [next(solved) if solution is None else solution for solution in cached]
+
+    try:
+        if ordered:
+            pending = collections.deque()
+            for start, chunk in chunk_puzzles(sudoku_puzzles, chunksize):
+                pending.append(submit(chunk))
+                if len(pending) >= max_pending:
+                    yield from collect(*pending.popleft())
+
+            while pending:
+                yield from collect(*pending.popleft())
+
+        else:
+            # Dict of {future: (index of the first puzzle in its chunk, submitted chunk)}
+            pending = {}
+            for start, chunk in chunk_puzzles(sudoku_puzzles, chunksize):
+                submitted = submit(chunk)
+                if submitted[2] is None:
+                    # Everything in the chunk was cached
+                    yield from enumerate(submitted[1], start)
+                    continue
+
+                pending[submitted[2]] = (start, submitted)
+
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        start, submitted = pending.pop(future)
+                        yield from enumerate(collect(*submitted), start)
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    start, submitted = pending.pop(future)
+                    yield from enumerate(collect(*submitted), start)
+    finally:
+        executor.shutdown(cancel_futures=True)
@@ -0,0 +1,389 @@
+"""
+A small HTTP server that solves puzzles sent to it as JSON, run with python -m sudoku_solver.server
+
+Requests are solved together: puzzles from every request are collected by a MicroBatcher for up to max_wait
+seconds, or until max_batch puzzles are waiting, and then solved at once with sudoku_solver_batch, either on
+the batcher's thread or by a pool of worker processes.
+
+Endpoints:
+    POST /solve         {"puzzle": puzzle} -> {"solution": solution, "status": status}
+    POST /solve_batch   {"puzzles": [puzzle, ...]} -> {"solutions": [solution, ...], "statuses": [status, ...]}
+    GET  /metrics       counts of the requests, puzzles and batches solved so far, as JSON
+
+A puzzle is a string in the one line format (see line_to_puzzle), a list of 81 ints, or a list of 9 lists of
+9 ints, with 0 for empty squares. Each solution is given back in the same form as its puzzle. The status of a
+solution is "solved", "unsolvable" (the solution is all -1s), or "gave up" if max_nodes was reached (the solution
+is the puzzle as far as it was narrowed down, with 0s left in it)
+"""
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import argparse
+import collections
+import json
+import queue
+import threading
+import time
+
+import numpy as np
+
+from .batch import sudoku_solver_batch
+from .lineformat import line_to_puzzle, puzzle_to_line
+from .parallel import puzzle_to_record, records_to_puzzles, solve_records
+from .solver import ENGINES
+
+
+class MicroBatcher:
+    """
+    Collects puzzles from many threads into batches, and solves each batch at once with sudoku_solver_batch.
+
+    A batch is started by the first puzzles that arrive, and is solved once max_batch puzzles are waiting, or
+    max_wait seconds after it was started, whichever is first. With workers, batches are solved by a pool of
+    worker processes while the next batch is collected, and no more than two batches per worker are solved at
+    once. If max_queue requests are already waiting, submit raises queue.Full rather than letting them pile up.
+
+    Attributes:
+        metrics: Counter of requests, puzzles, batches, batch_seconds (time spent solving batches), the number
+                 of puzzles solved, unsolvable and given up on, and failed_batches (batches that raised an
+                 exception, such as a worker process dying). Read it with get_metrics
+    """
+
+    def __init__(self, max_batch=64, max_wait=0.005, workers=1, engine="state", max_nodes=None, max_queue=1024):
+        if engine not in ENGINES:
+            raise ValueError("Unknown engine {!r}, expected one of {}".format(engine, ", ".join(ENGINES)))
+
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.engine = engine
+        self.max_nodes = max_nodes
+
+        # Queue of (Nx9x9 numpy array of puzzles, Future of their solutions), or None to stop the batcher
+        self.queue = queue.Queue(max_queue)
+
+        self.workers = workers
+        self.executor = ProcessPoolExecutor(workers) if workers > 1 else None
+        self.in_flight = threading.Semaphore(workers * 2)
+
+        self.lock = threading.Lock()
+        self.metrics = collections.Counter()
+
+        self.thread = threading.Thread(target=self.run, name="sudoku-batcher", daemon=True)
+        self.thread.start()
+
+    def submit(self, sudoku_puzzles):
+        """
+        Queues puzzles to be solved in the next batch
+
+        Input: Nx9x9 numpy array of puzzles
+        Output: Future of the Nx9x9 numpy array of their solutions (see sudoku_solver_batch)
+        Raises queue.Full if max_queue requests are already waiting
+        """
+        future = Future()
+        self.queue.put_nowait((sudoku_puzzles, future))
+        return future
+
+    def run(self):
+        """Collects and solves batches until close is called. Run by the batcher thread"""
+        stopping = False
+        while not stopping:
+            item = self.queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            size = len(item[0])
+            end = time.monotonic() + self.max_wait
+
+            while size < self.max_batch:
+                try:
+                    item = self.queue.get(timeout=max(end - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+
+                if item is None:
+                    stopping = True
+                    break
+
+                batch.append(item)
+                size += len(item[0])
+
+            try:
+                self.solve(batch)
+            except Exception as error:
+                # Keeps the batcher thread running whatever one batch raises, so that later requests are still solved
+                self.finish(batch, time.monotonic(), error)
+
+    def solve(self, batch):
+        """Solves a batch of (puzzles, future) pairs, and sets the result of each future"""
+        puzzles = np.concatenate([sudoku_puzzles for sudoku_puzzles, future in batch])
+        start = time.monotonic()
+
+        if self.executor is None:
+            try:
+                solutions = sudoku_solver_batch(puzzles, self.engine, max_nodes=self.max_nodes)
+            except Exception as error:
+                solutions = error
+            self.finish(batch, start, solutions)
+            return
+
+        # Waits for a worker to be free, so that batches don't build up in the pool faster than they're solved
+        self.in_flight.acquire()
+        try:
+            records = b"".join(puzzle_to_record(puzzle) for puzzle in puzzles)
+            try:
+                worker_future = self.executor.submit(solve_records, records, self.engine, self.max_nodes)
+            except BrokenProcessPool:
+                # A worker process died, which breaks the whole pool, so a new pool is started to solve this batch.
+                # The batches that were being solved when it died have already been given the BrokenProcessPool
+                self.executor.shutdown(wait=False)
+                self.executor = ProcessPoolExecutor(self.workers)
+                worker_future = self.executor.submit(solve_records, records, self.engine, self.max_nodes)
+        except Exception as error:
+            self.in_flight.release()
+            self.finish(batch, start, error)
+            return
+
+        def done(worker_future):
+            self.in_flight.release()
+            try:
+                solutions = records_to_puzzles(worker_future.result())
+            except Exception as error:
+                solutions = error
+            self.finish(batch, start, solutions)
+
+        worker_future.add_done_callback(done)
+
+    def finish(self, batch, start, solutions):
+        """Gives each future in a batch its part of the solutions, or the exception that solving raised"""
+        if isinstance(solutions, Exception):
+            with self.lock:
+                self.metrics["failed_batches"] += 1
+            for sudoku_puzzles, future in batch:
+                if not future.done():
+                    future.set_exception(solutions)
+            return
+
+        with self.lock:
+            self.metrics["batches"] += 1
+            self.metrics["batch_seconds"] += time.monotonic() - start
+            self.metrics["requests"] += len(batch)
+            self.metrics["puzzles"] += len(solutions)
+            for status in solution_statuses(solutions):
+                self.metrics[status] += 1
+
+        offset = 0
+        for sudoku_puzzles, future in batch:
+            future.set_result(solutions[offset:offset + len(sudoku_puzzles)])
+            offset += len(sudoku_puzzles)
+
+    def get_metrics(self):
+        """Returns a dict of the metrics, along with the mean batch size and the number of requests waiting"""
+        with self.lock:
+            metrics = dict(self.metrics)
+
+        metrics["mean_batch_size"] = metrics.get("puzzles", 0) / metrics["batches"] if metrics.get("batches") else 0
+        metrics["queued"] = self.queue.qsize()
+        return metrics
+
+    def close(self):
+        """Solves the batch being collected, then stops the batcher thread and the worker processes"""
+        self.queue.put(None)
+        self.thread.join()
+        if self.executor is not None:
+            self.executor.shutdown()
+
+
+def solution_statuses(solutions):
+    """Returns "solved", "unsolvable" or "gave up" for each solution in a Nx9x9 numpy array of solutions"""
+    return ["unsolvable" if solution[0, 0] == -1 else "solved" if solution.all() else "gave up"
+            for solution in solutions]
+
+
+def json_to_puzzle(puzzle):
+    """
+    Turns a puzzle from a request (see the module docstring) into a 9x9 numpy array of ints.
+    Raises ValueError if it isn't a puzzle
+    """
+    if isinstance(puzzle, str):
+        return line_to_puzzle(puzzle)
+
+    try:
+        values = np.array(puzzle)
+    except ValueError:
+        values = None
+
+    if values is None or values.size != 81 or values.dtype.kind not in "iu" or values.min() < 0 or values.max() > 9:
+        raise ValueError("Not a puzzle: {!r}".format(puzzle))
+
+    return values.reshape(9, 9)
+
+
+def solution_to_json(solution, puzzle):
+    """Turns a 9x9 numpy array solution into the same form as the puzzle from the request"""
+    if isinstance(puzzle, str):
+        return puzzle_to_line(solution)
+
+    return solution.reshape(np.shape(puzzle)).tolist()
+
+
+class SolveRequestHandler(BaseHTTPRequestHandler):
+    """Handles the requests of a SolveServer. See the module docstring for the endpoints"""
+
+    # Keeps connections open between requests, so that a client sending many requests doesn't reconnect each time
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = self.read_body()
+        if body is None:
+            return
+
+        if self.path != "/metrics":
+            self.send_json(404, {"error": "Not found: {}".format(self.path)})
+            return
+
+        self.send_json(200, self.server.batcher.get_metrics())
+
+    def do_POST(self):
+        body = self.read_body()
+        if body is None:
+            return
+
+        if self.path not in ("/solve", "/solve_batch"):
+            self.send_json(404, {"error": "Not found: {}".format(self.path)})
+            return
+
+        try:
+            body = json.loads(body)
+            if self.path == "/solve":
+                puzzles = [body["puzzle"]]
+            else:
+                puzzles = body["puzzles"]
+                if not isinstance(puzzles, list):
+                    raise ValueError("puzzles must be a list")
+
+            sudoku_puzzles = np.array([json_to_puzzle(puzzle) for puzzle in puzzles], dtype=np.int8).reshape(-1, 9, 9)
+        except (ValueError, KeyError, TypeError) as error:
+            self.send_json(400, {"error": "Bad request: {}".format(error)})
+            return
+
+        try:
+            if len(sudoku_puzzles):
+                solutions = self.server.batcher.submit(sudoku_puzzles).result(self.server.request_timeout)
+            else:
+                solutions = sudoku_puzzles
+        except queue.Full:
+            self.send_json(503, {"error": "Too many requests waiting, try again later"})
+            return
+        except TimeoutError:
+            self.send_json(504, {"error": "Timed out waiting for the solution"})
+            return
+        except Exception as error:
+            self.send_json(500, {"error": "Solving failed: {!r}".format(error)})
+            return
+
+        statuses = solution_statuses(solutions)
+        if self.path == "/solve":
+            self.send_json(200, {"solution": solution_to_json(solutions[0], puzzles[0]), "status": statuses[0]})
+        else:
+            self.send_json(200, {"solutions": [solution_to_json(solution, puzzle)
+                                               for solution, puzzle in zip(solutions, puzzles)],
+                                 "statuses": statuses})
+
+    def read_body(self):
+        """
+        Reads the body of the request, before anything else is done with it. Otherwise an error sent without reading
+        it would leave the body on the connection, to be read as the next request.
+        Returns None, having sent an error and closed the connection, if the length of the body isn't known
+        """
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            if length < 0 or "Transfer-Encoding" in self.headers:
+                raise ValueError
+        except ValueError:
+            # The end of the body can't be found, so the connection can't be used for another request
+            self.close_connection = True
+            self.send_json(411, {"error": "A Content-Length is needed"})
+            return None
+
+        return self.rfile.read(length)
+
+    def send_json(self, code, value):
+        body = json.dumps(value).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        # Only logs when the server is verbose, as a line for every request slows it down
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+class SolveServer(ThreadingHTTPServer):
+    """
+    A ThreadingHTTPServer that solves puzzles with a MicroBatcher, see the module docstring.
+    Each request is handled on its own thread, which waits for the batch its puzzles are in to be solved
+
+    Attributes:
+        batcher: the MicroBatcher that requests are solved by
+        request_timeout: the most seconds a request waits for its solutions before a 504 is sent, or None
+        verbose: if True, every request is logged to stderr
+    """
+
+    daemon_threads = True
+
+    # The listen backlog. Many clients connect at once when requests are being batched, and the default of 5
+    # makes connections get reset
+    request_queue_size = 128
+
+    def __init__(self, address, batcher, request_timeout=None, verbose=False):
+        super().__init__(address, SolveRequestHandler)
+        self.batcher = batcher
+        self.request_timeout = request_timeout
+        self.verbose = verbose
+
+    def server_close(self):
+        super().server_close()
+        self.batcher.close()
+
+
+def serve(host="127.0.0.1", port=8000, max_batch=64, max_wait=0.005, workers=1, engine="state", max_nodes=None,
+          max_queue=1024, request_timeout=None, verbose=False):
+    """Runs a SolveServer until it's interrupted. See MicroBatcher and SolveServer for the arguments"""
+    batcher = MicroBatcher(max_batch, max_wait, workers, engine, max_nodes, max_queue)
+    with SolveServer((host, port), batcher, request_timeout, verbose) as server:
+        print("Solving on http://{}:{}".format(*server.server_address[:2]))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+def main(argv=None):
+    """Command line entry point for python -m sudoku_solver.server"""
+    parser = argparse.ArgumentParser(description="Serves /solve, /solve_batch and /metrics over HTTP")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on (default 8000)")
+    parser.add_argument("--max-batch", type=int, default=64, help="most puzzles solved in a batch (default 64)")
+    parser.add_argument("--max-wait", type=float, default=5,
+                        help="most milliseconds to wait for a batch to fill up (default 5)")
+    parser.add_argument("-w", "--workers", type=int, default=1,
+                        help="number of processes to solve batches with, 1 to solve on the batcher thread (default 1)")
+    parser.add_argument("-e", "--engine", default="state", choices=sorted(ENGINES), help="solver to use")
+    parser.add_argument("--max-nodes", type=int, help="give up on a puzzle after searching this many nodes")
+    parser.add_argument("--max-queue", type=int, default=1024,
+                        help="most requests waiting for a batch before 503s are sent (default 1024)")
+    parser.add_argument("--timeout", type=float, help="seconds a request waits for its solution before a 504")
+    parser.add_argument("-v", "--verbose", action="store_true", help="log every request")
+    args = parser.parse_args(argv)
+
+    serve(args.host, args.port, args.max_batch, args.max_wait / 1000, args.workers, args.engine, args.max_nodes,
+          args.max_queue, args.timeout, args.verbose)
+
+
+if __name__ == "__main__":
+    main()
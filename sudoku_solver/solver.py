@@ -0,0 +1,179 @@
+"""
+sudoku_solver, the main entry point, the entry points for puzzles as flat lists and strings, and solution counting
+"""
+from .dlx import DancingLinksSolver
+from .limits import SolveLimits
+from .state import SudokuState, get_techniques
+from .stats import SolveStats
+from .tables import LINE_CHARACTER_VALUES, LINE_CHARACTERS
+
+
+# The classes that sudoku_solver can solve a puzzle with, by engine name
+ENGINES = {
+    "state": SudokuState,
+    "dlx": DancingLinksSolver,
+}
+
+
+def get_engine(engine, techniques=None, max_nodes=None, deadline=None, cancel=None):
+    """
+    Returns a function that makes a solver for a puzzle with the engine, techniques and limits (see sudoku_solver).
+    Each solver gets its own SolveLimits, so max_nodes is for each puzzle
+
+    Raises ValueError if the engine isn't in ENGINES, or techniques are given for an engine other than "state"
+    """
+    if engine not in ENGINES:
+        raise ValueError("Unknown engine {!r}, expected one of {}".format(engine, ", ".join(ENGINES)))
+
+    if techniques is not None:
+        if engine != "state":
+            raise ValueError("techniques can only be used with the state engine")
+        techniques = get_techniques(techniques)
+
+    has_limits = max_nodes is not None or deadline is not None or cancel is not None
+
+    def make_solver(puzzle):
+        if engine == "state":
+            solver = SudokuState(puzzle, techniques)
+        else:
+            solver = ENGINES[engine](puzzle)
+
+        if has_limits:
+            solver.limits = SolveLimits(max_nodes, deadline, cancel)
+        return solver
+
+    return make_solver
+
+
+def sudoku_solver(sudoku_puzzle, engine="state", cache=None, stats=False, techniques=None, max_nodes=None,
+                  deadline=None, cancel=None):
+    """
+    Solves a Sudoku puzzle and returns its unique solution.
+
+    Input
+        sudoku : 9x9 numpy array
+            Empty cells are designated by 0.
+        engine : str
+            The name of the solver in ENGINES to use. "state" narrows down and guesses with SudokuState,
+            "dlx" solves it as an exact cover problem with DancingLinksSolver
+        cache : SolutionCache or DiskSolutionCache
+            If given, the solution is looked up in the cache first, and stored in the cache if it has to be solved
+        stats : bool
+            If True, the work done solving is counted, and returned along with the solution
+        techniques : iterable of str
+            The techniques the "state" engine narrows down with once there are no singles left, in the order
+            they are tried, e.g. ("locked candidates", "naked pair", "hidden pair", "x-wing", "swordfish").
+            Defaults to NARROW_TECHNIQUES, see TECHNIQUES for every name
+        max_nodes : int
+            If given, solving gives up after searching this many nodes (see SolveStats.nodes)
+        deadline : float
+            If given, solving gives up once time.monotonic() reaches it, e.g. time.monotonic() + 0.1
+        cancel : cancellation token
+            If given, solving gives up once cancel.is_set() is True. threading.Event, or multiprocessing.Event
+            across processes, can be used
+
+    Output
+        9x9 numpy array of integers
+            It contains the solution, if there is one. If there is no solution, all array entries should be -1.
+        If stats is True, a (9x9 numpy array, SolveStats) pair is returned instead
+
+    Raises SolveLimitExceeded if solving gave up because of max_nodes, deadline or cancel. Nothing is stored in
+    the cache when it does
+    """
+
+    make_solver = get_engine(engine, techniques, max_nodes, deadline, cancel)
+
+    if stats:
+        solve_stats = SolveStats()
+        solve_stats.cached = True
+
+        def solve(puzzle):
+            solve_stats.cached = False
+            solver = make_solver(puzzle)
+            solver.stats = solve_stats
+            return solver.get_solved_numpy()
+
+        solution = solve(sudoku_puzzle) if cache is None else cache.get_or_solve(sudoku_puzzle, solve)
+        return solution, solve_stats
+
+    if cache is not None:
+        return cache.get_or_solve(sudoku_puzzle, lambda puzzle: make_solver(puzzle).get_solved_numpy())
+
+    return make_solver(sudoku_puzzle).get_solved_numpy()
+
+
+def solve_values(values, engine="state", techniques=None, max_nodes=None, deadline=None, cancel=None):
+    """
+    Solves a sudoku given as a flat list, without numpy
+
+    Input
+        values : iterable of 81 ints
+            The squares in row major order, empty cells being 0
+        engine, techniques, max_nodes, deadline, cancel : see sudoku_solver
+    Output
+        list of 81 ints
+            The solution in row major order, if there is one. If there is no solution, every value is -1
+
+    Raises ValueError if there aren't 81 values, and SolveLimitExceeded if solving gave up
+    """
+    values = list(values)
+    if len(values) != 81:
+        raise ValueError("A puzzle has 81 values, not {}".format(len(values)))
+
+    rows = [values[row * 9:row * 9 + 9] for row in range(9)]
+    return get_engine(engine, techniques, max_nodes, deadline, cancel)(rows).get_solved_values()
+
+
+def solve_string(puzzle, engine="state", techniques=None, max_nodes=None, deadline=None, cancel=None):
+    """
+    Solves a sudoku given in the one line format, without numpy
+
+    Input
+        puzzle : str or bytes
+            81 characters in row major order, with "." or "0" for empty squares (see sudoku_solver.line_to_puzzle)
+        engine, techniques, max_nodes, deadline, cancel : see sudoku_solver
+    Output
+        str or bytes, the same type as puzzle
+            The solution in the one line format, if there is one. If there is no solution, it's 81 "-"s
+
+    Raises ValueError if the puzzle isn't 81 of the characters above, and SolveLimitExceeded if solving gave up
+    """
+    # Both str and bytes are read as character codes
+    codes = puzzle.strip().encode("ascii", "replace") if isinstance(puzzle, str) else bytes(puzzle).strip()
+
+    try:
+        values = [LINE_CHARACTER_VALUES[code] for code in codes]
+    except KeyError:
+        values = None
+
+    if values is None or len(values) != 81:
+        raise ValueError("Not a puzzle line: {!r}".format(puzzle))
+
+    solution = solve_values(values, engine, techniques, max_nodes, deadline, cancel)
+    solution = "".join([LINE_CHARACTERS[value + 1] for value in solution])
+
+    if isinstance(puzzle, str):
+        return solution
+    return solution.encode("ascii")
+
+
+def count_solutions(sudoku_puzzle, limit=2):
+    """
+    Counts the solutions of a sudoku, stopping as soon as limit solutions have been found
+
+    Input
+        sudoku_puzzle : 9x9 numpy array, empty cells are 0
+        limit : int, the most solutions to count. With the default of 2, the count shows if the solution is unique
+    Output
+        int, the number of solutions, no more than limit
+    """
+    state = SudokuState(sudoku_puzzle)
+    if state.check() == -1:
+        return 0
+
+    return state.count_solutions(limit)
+
+
+def has_unique_solution(sudoku_puzzle):
+    """Returns True if the sudoku (a 9x9 numpy array) has exactly one solution"""
+    return count_solutions(sudoku_puzzle, 2) == 1
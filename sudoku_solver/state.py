@@ -0,0 +1,1081 @@
+"""
+SudokuState, which solves a sudoku by narrowing down the values each square could be, and guessing when it can't.
+Also the techniques it can narrow down with.
+
+numpy is only imported when a numpy array is asked for, see values_to_numpy. Without numpy, puzzles can be given as
+any 9x9 iterable of ints, and solutions taken out as flat lists with SudokuState.get_solved_values
+"""
+from array import array
+import itertools
+import time
+
+from .tables import (ALL_VALUES, BIT_COUNT, COLUMN_SEGMENTS, FILLED, LOWEST_VALUE, MASK_VALUES, PEERS, PEER_SETS,
+                     POSITIONS, ROW_SEGMENTS, SQUARE_UNIT_INDEXES, SQUARE_UNITS, UNITS, VALUE_BIT)
+
+
+class SudokuState:
+    """
+    A class containing all methods and attributes needed to solve a sudoku puzzle
+
+    Many states can be held at once while solving, so instances have no __dict__, and the whole state is a
+    single flat array that can be copied in one go with SudokuState.copy
+    """
+
+    __slots__ = ("state", "techniques", "trail", "stats", "limits")
+
+    def __init__(self, state, techniques=None):
+        """
+        Input is a 9x9 numpy array of ints, with emtpy cells being
+        zeros, and optionally the techniques to use (see below)
+
+        self.state is a flat array of 81 unsigned shorts, one per square in row major order (see POSITIONS).
+        A filled in square is FILLED | VALUE_BIT[value], and an empty square is a mask of the values that it could
+        possibly be
+
+        self.trail is a list of (square, old value) pairs, one for every change made to the state by
+        fill_in_square and remove_value, so that the changes can be rolled back with SudokuState.undo
+
+        self.stats is a SolveStats that the work done solving is counted in, or None to not count anything
+
+        self.limits is a SolveLimits that solve and propagate give up at, by raising SolveLimitExceeded, or None
+        to solve however long it takes
+
+        self.techniques is a tuple of the techniques narrow uses once there are no singles left, in the same form
+        as NARROW_TECHNIQUES. Defaults to NARROW_TECHNIQUES. techniques can also be given as names from TECHNIQUES,
+        see get_techniques
+        """
+
+        self.state = array("H", (max(int(num), 0) for row in state for num in row))
+
+        self.techniques = NARROW_TECHNIQUES if techniques is None else get_techniques(techniques)
+
+        self.trail = []
+
+        self.stats = None
+
+        self.limits = None
+
+        # Changes the format of the state, turning every empty cell into a mask of possible values that could be in
+        # the space.
+        self.setup()
+
+    def copy(self):
+        """
+        Returns a new SudokuState with a copy of this state. Doesn't run setup again
+        """
+        new_state = SudokuState.__new__(SudokuState)
+        new_state.state = self.state[:]
+        new_state.techniques = self.techniques
+        new_state.trail = []
+        new_state.stats = self.stats
+        new_state.limits = self.limits
+        return new_state
+
+    def undo(self, checkpoint):
+        """
+        Rolls back every change made to the state since the trail was checkpoint long
+
+        Input:
+            checkpoint: int, the length of self.trail at the point the state should go back to
+        """
+        trail = self.trail
+        state = self.state
+        while len(trail) > checkpoint:
+            square, value = trail.pop()
+            state[square] = value
+
+    def setup(self):
+        """
+        Modifies the state such that all given values are marked as filled in, and all emtpy cells are
+        replaced with a mask of values that could be in the cell
+        """
+        # Marks the given values as filled in first, so that they can be told apart from the masks of empty cells
+        for square in range(81):
+            value = self.state[square]
+            if value > 0:
+                self.state[square] = FILLED | VALUE_BIT[value]
+
+        for square in range(81):
+            # Runs though each item in the sudoku
+            if self.state[square] == 0:
+                # If the square is empty...
+
+                possible_values = ALL_VALUES  # Values that the value in position it could potentially be,
+                # initialised as numbers 1 to 9
+
+                # Runs though each neighbour to the square
+                for neighbour in PEERS[square]:
+                    neighbour_value = self.state[neighbour]
+                    if neighbour_value & FILLED:
+                        # A neighbour has a given value, so the value for the square cannot include this neighbour
+                        # value
+                        possible_values &= ~neighbour_value
+
+                self.state[square] = possible_values
+
+    def get_neighbors(self, position, section=(True, True, True)):
+        """
+        Gets the 'neighbors' of given position. Doesn't return the input position
+        The neighbors of a position is every number in it's row, it's column, and it's box by default.
+        By setting
+
+        Input:
+            position: A iterable of 2 ints (row major order)
+
+            section: A tuple of 3 booleans. all set to true by default
+            Changing these values to only get neighbors from the position's row, column, or box.
+            If section[0] = True, then it returns neighbors from the position's row.
+            If section[1] = True, then it returns neighbors from the position's column.
+            If section[2] = True, then it returns neighbors from the position's box.
+            Multiple bools in section can be set to True
+
+        Output: A dictionary with each key being a position (a pair of ints in a tuple), and it's value being the
+                int stored in the state at that position (see SudokuState.__init__)
+        """
+        # The output dict. Will return this list at the end of the function
+        output = {}
+
+        square = position[0] * 9 + position[1]
+
+        # Adds the squares from the row, column, and box, as chosen by section
+        for include_unit, unit in zip(section, SQUARE_UNITS[square]):
+            if include_unit:
+                for other_square in unit:
+                    row, col = POSITIONS[other_square]
+                    output[(row, col)] = self.state[row * 9 + col]
+
+        # Removes the input position from the output dictionary
+        del output[POSITIONS[square]]
+
+        return output
+
+    def get_values(self):
+        """
+        Returns the value of every square as a flat list of 81 ints in row major order, with empty squares as 0s
+        """
+        return [LOWEST_VALUE[num & ALL_VALUES] if num & FILLED else 0 for num in self.state]
+
+    def get_proper_values(self, solvable):
+        """
+        Returns get_values, or a list of 81 -1s if solvable is -1
+        """
+        if solvable == -1:
+            return [-1] * 81
+
+        return self.get_values()
+
+    def get_numpy_state(self):
+        """
+        Returns a 9x9 int8 numpy array of the state, with empty squares as 0s
+        """
+        return values_to_numpy(self.get_values())
+
+    def get_empty_states(self):
+        """
+        Returns the states that are empty
+
+        Input: None
+        Output: Dict with keys of pairs of ints in a tuple, and values of the mask of possible values of the
+        square at that position.    Ruffly {position: self.state[position]}
+        """
+        output = {}
+        for square, value in enumerate(self.state):
+            # For every square...
+
+            if not value & FILLED:
+                output[POSITIONS[square]] = value
+
+        return output
+
+    def get_empty_neighbours(self, position, section=(True, True, True)):
+        """
+        Retuns the empty 'neighbours' of a given position
+
+        Input:
+            position: tuple of 2 ints, which are the index's of the state you want the neighbours of
+            section: tuple of boolean if neighbours from the row, column, or box.
+            By default, set to return every neighbour of the position
+        Output:
+            dict of empty neighbours in the form of {position of neighbour: mask of possible values for neighbour}
+        """
+        square = position[0] * 9 + position[1]
+
+        if section == (True, True, True):
+            neighbours = PEERS[square]
+        else:
+            neighbours = sorted(set(itertools.chain.from_iterable(
+                unit for include_unit, unit in zip(section, SQUARE_UNITS[square]) if include_unit)) - {square})
+
+        # Only neighbours that are not filled in are kept
+        output = {}
+        for neighbour in neighbours:
+            row, col = POSITIONS[neighbour]
+            if not self.state[row * 9 + col] & FILLED:
+                output[(row, col)] = self.state[row * 9 + col]
+
+        return output
+
+    def get_numpy_proper_state(self, solvable):
+        """
+        Returns a numpy state with the empty states being replaced with 0s
+        if it cannot be solved then every element will be replaced with -1
+        """
+        return values_to_numpy(self.get_proper_values(solvable))
+
+    def remove_value(self, position, value):
+        """Removes a value from a given position"""
+        square = position[0] * 9 + position[1]
+        if not self.state[square] & FILLED:
+            self.trail.append((square, self.state[square]))
+            self.state[square] &= ~VALUE_BIT[value]
+
+    @staticmethod
+    def is_neighbour(position1, position2):
+        """
+        Returns a True or False. Returns True if the two positions are neighbours of each other
+        Returns False otherwise
+        Returns False if the two positions are the same position
+        """
+
+        if position1 == position2:
+            return False
+
+        if position1[0] == position2[0]:
+            return True
+
+        if position1[1] == position2[1]:
+            return True
+
+        if (position1[0] // 3, position1[1] // 3) == (position2[0] // 3, position2[1] // 3):
+            # In the same box
+            return True
+
+        return False
+
+    def analise_empty_value(self, position):
+        """
+        Looks at a emtpy square and see's if it can remove some possible values
+        from it's neighbours.
+        If the emtpy value can only be one value, it fills in this value
+        If it can remove possible values, it calls the remove values function.
+
+        Returns -1 if the state is now unsolvable
+        Returns 0 otherwise
+        """
+
+        if self.stats is not None:
+            self.stats.analise_empty_value_calls += 1
+
+        square = position[0] * 9 + position[1]
+        current_possible_values = self.state[square]
+
+        if current_possible_values & FILLED:
+            return 0
+
+        if current_possible_values == 0:
+            # Sudoku was shown to be impossible
+            return -1
+
+        # If the square can only be one value, fill it in
+        squares_to_fill = []
+        if BIT_COUNT[current_possible_values] == 1:
+            squares_to_fill.append((square, LOWEST_VALUE[current_possible_values], "naked single"))
+
+        # Checks the row, column, and box of the square for values that can only go in one square
+        return self.propagate(squares_to_fill, SQUARE_UNIT_INDEXES[square])
+
+    def get_sets(self, position):
+        """
+        Returns a list of dictionary that is the row of this position, the column of the position,
+        and the box of this position
+
+        Both empty and non empty squares are included
+        The input position is included
+        """
+        output = []
+        for unit in SQUARE_UNITS[position[0] * 9 + position[1]]:
+            output.append({POSITIONS[square]: self.state[square] for square in unit})
+
+        return output
+
+    def get_value_from_pos(self, position):
+        """Returns the value of the state at a given position"""
+        return self.state[position[0] * 9 + position[1]]
+
+    def fill_in_square(self, position, value, technique="guess"):
+        """
+        Updates the value of an empty square to a value given.
+        Then updates values of neighbouring squares that have had possibilities
+        removed that can now be filled in, see SudokuState.propagate
+
+        Inputs:
+            position: tuple containing 2 ints between 0 and 8, which is the index of the square you want to fill in
+            value: int, which is the value that you want to update the given square to
+            technique: str, the reason the square is being filled in, used to count eliminations in self.stats
+        Output:
+            int, if output = 0, then it filled in fine and found no contractions (empty squares with no possible values
+            that they could be)
+            if output = -1, then a empty square with no possible values that the square could be was found. This would
+            mean that the state when the root function was first called is impossible to solve.
+            also returns -2 if the given position is not empty
+        """
+
+        if self.stats is not None:
+            self.stats.fill_in_square_calls += 1
+
+        square = position[0] * 9 + position[1]
+
+        if self.state[square] & FILLED:
+            return -2
+
+        return self.propagate([(square, value, technique)], ())
+
+    def propagate(self, squares_to_fill, units_to_check):
+        """
+        Fills in squares, and keeps filling in every square that can then be filled in, until nothing more can be
+        filled in without guessing. Doesn't use recursion.
+
+        Two lists of work are kept:
+            squares that must be filled in with a value, as it's the only value they could be (or as the value can
+            only be in that square in one of it's rows, columns, or boxes)
+            rows, columns, and boxes that have had values removed from them, and so need to be checked again for
+            values that can now only go in one square
+
+        Filling in a square removes its value from its neighbours, which can add squares and units to check.
+        Every waiting square is filled in before the units are checked, so a unit is checked once however many of
+        its squares have changed.
+
+        Inputs:
+            squares_to_fill: list of (square, value, technique) tuples, with square being an index of self.state,
+            and technique the reason it's being filled in (see SolveStats.eliminations)
+            units_to_check: iterable of indexes of UNITS
+        Output:
+            int, 0 if no contradictions were found, and -1 if the state is now impossible to solve
+        """
+        state = self.state
+        trail = self.trail
+        stats = self.stats
+        limits = self.limits
+        dirty_units = set(units_to_check)
+
+        while squares_to_fill or dirty_units:
+            if limits is not None:
+                limits.check()
+
+            while squares_to_fill:
+                square, value, technique = squares_to_fill.pop()
+                bit = VALUE_BIT[value]
+                current_value = state[square]
+
+                if current_value & FILLED:
+                    if current_value & bit:
+                        # Already filled in with this value
+                        continue
+
+                    # The square had to be two different values
+                    return -1
+
+                if not current_value & bit:
+                    # The square can no longer be this value
+                    return -1
+
+                if stats is not None:
+                    # Every value removed from a neighbour adds to the trail
+                    trail_length = len(trail) + 1
+
+                trail.append((square, current_value))
+                state[square] = FILLED | bit
+                dirty_units.update(SQUARE_UNIT_INDEXES[square])
+
+                # Remove the value from neighbours that have the possibility of being the given value
+                for neighbour in PEERS[square]:
+                    neighbour_value = state[neighbour]
+
+                    if not neighbour_value & bit:
+                        continue
+
+                    if neighbour_value & FILLED:
+                        # A neighbour is already filled in with this value
+                        return -1
+
+                    trail.append((neighbour, neighbour_value))
+                    neighbour_value &= ~bit
+                    state[neighbour] = neighbour_value
+
+                    if neighbour_value == 0:
+                        # This state is impossible to solve with this move
+                        return -1
+
+                    if BIT_COUNT[neighbour_value] == 1:
+                        squares_to_fill.append((neighbour, LOWEST_VALUE[neighbour_value], "naked single"))
+
+                    dirty_units.update(SQUARE_UNIT_INDEXES[neighbour])
+
+                if stats is not None:
+                    stats.eliminations[technique] += len(trail) - trail_length
+
+            while dirty_units and not squares_to_fill:
+                unit = UNITS[dirty_units.pop()]
+
+                # Masks of values that are filled in, possible in at least one square, and possible in at least two
+                # squares of the unit
+                filled_values = 0
+                possible_once = 0
+                possible_twice = 0
+                for square in unit:
+                    value = state[square]
+                    if value & FILLED:
+                        filled_values |= value
+                    else:
+                        possible_twice |= possible_once & value
+                        possible_once |= value
+
+                if (filled_values | possible_once) & ALL_VALUES != ALL_VALUES:
+                    # A value can't go anywhere in this row, column, or box
+                    return -1
+
+                # Values that can only be in one square of the unit
+                single_values = possible_once & ~possible_twice & ~filled_values
+                for value in MASK_VALUES[single_values]:
+                    bit = VALUE_BIT[value]
+                    for square in unit:
+                        if state[square] & bit:
+                            squares_to_fill.append((square, value, "hidden single"))
+                            break
+
+        return 0
+
+    def eliminate(self, eliminations, technique):
+        """
+        Removes possible values from empty squares, then fills in everything that follows with
+        SudokuState.propagate. Used by the techniques below, which find values that can be removed without guessing
+
+        Inputs:
+            eliminations: dict of {square: mask of values to remove from it}. Filled in squares are skipped
+            technique: str, the technique the values were found by, used to count eliminations in self.stats
+        Output:
+            int, 1 if any values were removed and no contradictions were found, 0 if there was nothing to remove,
+            and -1 if the state is now impossible to solve
+        """
+        state = self.state
+        trail = self.trail
+
+        squares_to_fill = []
+        changed_units = set()
+        for square, values in eliminations.items():
+            value = state[square]
+            if value & FILLED or not value & values:
+                continue
+
+            trail.append((square, value))
+            value &= ~values
+            state[square] = value
+
+            if value == 0:
+                return -1
+
+            if self.stats is not None:
+                self.stats.eliminations[technique] += BIT_COUNT[state[square] ^ trail[-1][1]]
+
+            if BIT_COUNT[value] == 1:
+                squares_to_fill.append((square, LOWEST_VALUE[value], "naked single"))
+
+            changed_units.update(SQUARE_UNIT_INDEXES[square])
+
+        if not changed_units:
+            return 0
+
+        if self.propagate(squares_to_fill, changed_units) == -1:
+            return -1
+
+        return 1
+
+    def get_candidates(self):
+        """Returns a list of the mask of possible values of every square, with 0 for filled in squares"""
+        return [0 if value & FILLED else value for value in self.state]
+
+    def get_value_places(self):
+        """
+        Returns the places every value could go, as 9 bit masks, in one pass over the state.
+
+        Output: (row_places, column_places). row_places[value][row] has bit col set if the value could go in the
+        square at (row, col), and column_places[value][col] has bit row set. Index 0 of both is unused
+        """
+        row_places = [[0] * 9 for _ in range(10)]
+        column_places = [[0] * 9 for _ in range(10)]
+
+        for square, value in enumerate(self.state):
+            if value & FILLED:
+                continue
+
+            row, col = POSITIONS[square]
+            for possible_value in MASK_VALUES[value]:
+                row_places[possible_value][row] |= 1 << col
+                column_places[possible_value][col] |= 1 << row
+
+        return row_places, column_places
+
+    def locked_candidates(self):
+        """
+        Finds values that, inside a box, can only be in one row or column of the box, so can't be anywhere else
+        in that row or column (pointing). And values that, inside a row or column, can only be in one box, so
+        can't be anywhere else in that box (claiming).
+
+        Each row (or column) is split into the 3 segments where it crosses a box. A value that is in a segment but
+        nowhere else in the box is locked to the rest of the line, and a value that is in a segment but nowhere
+        else in the line is locked to the rest of the box.
+
+        Output: int, see SudokuState.eliminate
+        """
+        candidates = self.get_candidates()
+        eliminations = {}
+
+        for line_segments in (ROW_SEGMENTS, COLUMN_SEGMENTS):
+            # The mask of values possible in each segment of every line
+            masks = [[candidates[a] | candidates[b] | candidates[c] for a, b, c in segments]
+                     for segments in line_segments]
+
+            for line in range(9):
+                # The other lines going through the same 3 boxes
+                band = [other for other in range(line - line % 3, line - line % 3 + 3) if other != line]
+
+                for i in range(3):
+                    segment = masks[line][i]
+                    if not segment:
+                        continue
+
+                    rest_of_line = masks[line][(i + 1) % 3] | masks[line][(i + 2) % 3]
+                    rest_of_box = masks[band[0]][i] | masks[band[1]][i]
+
+                    pointing = segment & ~rest_of_box & rest_of_line
+                    if pointing:
+                        for j in ((i + 1) % 3, (i + 2) % 3):
+                            for square in line_segments[line][j]:
+                                eliminations[square] = eliminations.get(square, 0) | pointing
+
+                    claiming = segment & ~rest_of_line & rest_of_box
+                    if claiming:
+                        for other in band:
+                            for square in line_segments[other][i]:
+                                eliminations[square] = eliminations.get(square, 0) | claiming
+
+        return self.eliminate(eliminations, "locked candidates")
+
+    def naked_subsets(self, size):
+        """
+        Finds size squares in a row, column, or box that between them can only be size values (a naked pair for
+        size 2, triple for 3, quad for 4). Those values must go in those squares, so are removed from every other
+        square of the unit.
+
+        Output: int, see SudokuState.eliminate
+        """
+        candidates = self.get_candidates()
+        eliminations = {}
+
+        for unit in UNITS:
+            empty_squares = [square for square in unit if candidates[square]]
+            if len(empty_squares) <= size:
+                continue
+
+            small_squares = [square for square in empty_squares if BIT_COUNT[candidates[square]] <= size]
+            for subset in itertools.combinations(small_squares, size):
+                values = 0
+                for square in subset:
+                    values |= candidates[square]
+
+                if BIT_COUNT[values] != size:
+                    continue
+
+                for square in empty_squares:
+                    if square not in subset and candidates[square] & values:
+                        eliminations[square] = eliminations.get(square, 0) | values
+
+        return self.eliminate(eliminations, "naked subset")
+
+    def hidden_subsets(self, size):
+        """
+        Finds size values in a row, column, or box that between them can only go in size squares (a hidden pair
+        for size 2, triple for 3, quad for 4). Those squares must hold those values, so every other value is
+        removed from them.
+
+        Output: int, see SudokuState.eliminate
+        """
+        candidates = self.get_candidates()
+        eliminations = {}
+
+        for unit in UNITS:
+            # A 9 bit mask for each value of the places in the unit it could go
+            places = {}
+            for place, square in enumerate(unit):
+                for value in MASK_VALUES[candidates[square]]:
+                    places[value] = places.get(value, 0) | 1 << place
+
+            if len(places) <= size:
+                continue
+
+            values_to_try = [value for value in places if BIT_COUNT[places[value]] <= size]
+            for subset in itertools.combinations(values_to_try, size):
+                subset_places = 0
+                values = 0
+                for value in subset:
+                    subset_places |= places[value]
+                    values |= VALUE_BIT[value]
+
+                if BIT_COUNT[subset_places] != size:
+                    continue
+
+                for place in MASK_VALUES[subset_places]:
+                    square = unit[place - 1]
+                    if candidates[square] & ~values:
+                        eliminations[square] = eliminations.get(square, 0) | (ALL_VALUES & ~values)
+
+        return self.eliminate(eliminations, "hidden subset")
+
+    def fish(self, size):
+        """
+        Finds size rows in which a value can only go in the same size columns (an X-Wing for size 2, Swordfish
+        for 3, Jellyfish for 4). The value has to be in each of those columns in one of those rows, so it's
+        removed from the rest of the columns. The same is done the other way round, with columns as the base.
+
+        The places a value can go are kept as a 9 bit mask per row (of columns) and per column (of rows), see
+        SudokuState.get_value_places.
+
+        Output: int, see SudokuState.eliminate
+        """
+        row_places, column_places = self.get_value_places()
+        eliminations = {}
+
+        for value in range(1, 10):
+            bit = VALUE_BIT[value]
+
+            for base_places, to_square in ((row_places[value], lambda line, cross: line * 9 + cross),
+                                           (column_places[value], lambda line, cross: cross * 9 + line)):
+                lines = [line for line in range(9) if 2 <= BIT_COUNT[base_places[line]] <= size]
+                if len(lines) < size:
+                    continue
+
+                for subset in itertools.combinations(lines, size):
+                    cover = 0
+                    for line in subset:
+                        cover |= base_places[line]
+
+                    if BIT_COUNT[cover] != size:
+                        continue
+
+                    for line in range(9):
+                        if line in subset or not base_places[line] & cover:
+                            continue
+
+                        for cross in MASK_VALUES[base_places[line] & cover]:
+                            square = to_square(line, cross - 1)
+                            eliminations[square] = eliminations.get(square, 0) | bit
+
+        return self.eliminate(eliminations, "fish")
+
+    def simple_colouring(self):
+        """
+        Single value chains. For each value, squares joined by being the only two places for the value in a row,
+        column, or box form chains, in which the value is in every other square. The squares of each chain are
+        coloured in two colours, so that the value is either in every square of one colour or every square of the
+        other.
+            If two squares of the same colour are neighbours, that colour can't have the value, so it's removed
+            from every square of that colour
+            If a square outside the chain is a neighbour of squares of both colours, the value is removed from it
+
+        Output: int, see SudokuState.eliminate
+        """
+        candidates = self.get_candidates()
+        eliminations = {}
+
+        for value in range(1, 10):
+            bit = VALUE_BIT[value]
+
+            # {square: list of squares it's the only other place for the value with, in some unit}
+            links = {}
+            for unit in UNITS:
+                places = [square for square in unit if candidates[square] & bit]
+                if len(places) == 2:
+                    links.setdefault(places[0], []).append(places[1])
+                    links.setdefault(places[1], []).append(places[0])
+
+            colours = {}
+            for start in links:
+                if start in colours:
+                    continue
+
+                # Colours the chain that start is in, as two lists of squares
+                chain = ([start], [])
+                colours[start] = 0
+                to_visit = [start]
+                while to_visit:
+                    square = to_visit.pop()
+                    for linked in links[square]:
+                        if linked not in colours:
+                            colours[linked] = 1 - colours[square]
+                            chain[colours[linked]].append(linked)
+                            to_visit.append(linked)
+
+                if len(chain[1]) == 0:
+                    continue
+
+                for colour in chain:
+                    if any(PEER_SETS[a] & set(colour[i + 1:]) for i, a in enumerate(colour)):
+                        for square in colour:
+                            eliminations[square] = eliminations.get(square, 0) | bit
+
+                coloured = set(chain[0]) | set(chain[1])
+                for square, square_candidates in enumerate(candidates):
+                    if square_candidates & bit and square not in coloured:
+                        peers = PEER_SETS[square]
+                        if any(a in peers for a in chain[0]) and any(b in peers for b in chain[1]):
+                            eliminations[square] = eliminations.get(square, 0) | bit
+
+        return self.eliminate(eliminations, "simple colouring")
+
+    def narrow(self):
+        """
+        Narrows down the sudoku, filling in all positions that can be filled in, and removing some possible
+        values.
+        Will not do this completely, but will never guess.
+
+        It will also check every row, column, and box to make sure that every value can be or is in this row, column,
+        or box
+
+        Once there are no singles left, the techniques in self.techniques are tried from the first. When one
+        removes any values, everything that follows is filled in and it goes back to the first technique, until
+        none of them remove anything
+
+        Returns an int.
+            returns 0 if not finished but found no contradictions
+            returns 1 if the sudoku is now solved
+            returns -1 if the sudoku was found to be unsolvable
+        """
+
+        squares_to_fill = []
+        for square, value in enumerate(self.state):
+            if value & FILLED:
+                continue
+
+            if value == 0:
+                # This sudoku can not solved
+                return -1
+
+            # If we can fill in this square, fill it in
+            if BIT_COUNT[value] == 1:
+                squares_to_fill.append((square, LOWEST_VALUE[value], "naked single"))
+
+        # Every row, column, and box is checked to make sure that every value can be or is in it
+        if self.propagate(squares_to_fill, range(len(UNITS))) == -1:
+            return -1
+
+        while self.techniques and not self.is_solved():
+            for name, technique, arguments in self.techniques:
+                outcome = technique(self, *arguments)
+                if outcome != 0:
+                    break
+
+            if outcome == -1:
+                return -1
+
+            if outcome == 0:
+                # No technique removed anything
+                break
+
+        return self.is_solved()
+
+    def check(self):
+        """
+        Checks the current state to see if there are contradictions already in the sudoku
+        Returns -1 if 2 or more neighbouring squares have the same value
+        Also returns -1 if an emtpy square which has no possible values it could be
+        Returns 0 otherwise
+        """
+        for square, value in enumerate(self.state):
+            if value & FILLED:
+                for neighbour in PEERS[square]:
+                    if self.state[neighbour] == value:
+                        return -1
+        return 0
+
+    def is_solved(self):
+        """Returns 1 if solved, returns 0 otherwise"""
+        for value in self.state:
+            if not value & FILLED:
+                return 0
+        return 1
+
+    def least_constraining_value(self, position):
+        """
+        Takes as input the position of an empty space, and returns the value
+        that the empty state would need to take, to constrain the neighbouring
+        states the least
+
+        Input: tuple of a postion in the state
+        Output: int of a value it could take
+        """
+
+        values = MASK_VALUES[self.state[position[0] * 9 + position[1]]]
+
+        empty_neighbours = self.get_empty_neighbours(position)
+
+        # The number of neighbours that has a possible value of a given value
+        constraints = {v: 0 for v in values}
+
+        # Running though all the possible neighbours.
+        for possible_empty_neighbours_values in empty_neighbours.values():
+            for value in values:
+                if possible_empty_neighbours_values & VALUE_BIT[value]:
+                    constraints[value] += 1
+
+        constraints = list(constraints.items())
+        constraints.sort(key=lambda x: x[1])
+
+        return constraints[0][0]
+
+    def solve(self):
+        """
+        Changes the state into a solved sudoku if it can.
+        This function is recursive
+
+        Returns 1 if the sudoku was solved
+        Returns -1 if the sudoku was unsolvable
+        Raises SolveLimitExceeded if self.limits is reached
+        """
+        if self.limits is not None:
+            self.limits.count_node()
+
+        stats = self.stats
+        if stats is not None:
+            stats.nodes += 1
+            narrow_start = time.perf_counter()
+
+        # Narrows down possible options until there are at least 2 possible options for every empty square,
+        # or it was solved or shown to be unsolvable
+        outcome = self.narrow()
+
+        if stats is not None:
+            stats.narrow_time += time.perf_counter() - narrow_start
+
+        # If the outcome is not zero, then the sudoku is solved or known to be unsolvable
+        if outcome != 0:
+            return outcome
+
+        if self.is_solved() == 1:
+            return 1
+
+        # Will now find the solution by guessing
+
+        # The position of the square with the least number of possible values it could be
+        # Implementation of Minimum remaining values heuristic
+        square_to_edit = min(self.get_empty_states().items(), key=lambda x: BIT_COUNT[x[1]])[0]
+
+        # The point in the trail to roll back to if a guess is wrong
+        checkpoint = len(self.trail)
+
+        # While there are values at the square to edit
+        while not self.get_value_from_pos(square_to_edit) & FILLED and self.get_value_from_pos(square_to_edit):
+            guess_of_value = self.least_constraining_value(square_to_edit)
+
+            if stats is not None:
+                stats.guesses += 1
+                stats.depth += 1
+                stats.max_depth = max(stats.max_depth, stats.depth)
+
+            # Fill in the value
+            outcome_of_guess = self.fill_in_square(square_to_edit, guess_of_value)
+
+            if outcome_of_guess == 0:
+                outcome_of_guess = self.solve()
+
+            if stats is not None:
+                stats.depth -= 1
+
+            # outcome_of_guess is 1 if the sudoku is from the guess solved,
+            # and -1 if the sudoku is unsolvable from the guess
+
+            # if the outcome is 1, then the sudoku is solved
+            if outcome_of_guess == 1:
+                return 1
+
+            if outcome_of_guess == -1:
+                # If the sudoku was unsolvable, then square_to_edit cannot
+                # be in possible values.
+                # Remove it from possible values, and analise it to see if that
+                # gives us a little more information
+                if stats is not None:
+                    stats.backtracks += 1
+
+                self.undo(checkpoint)
+                self.remove_value(square_to_edit, guess_of_value)
+
+                # If this is -1, then the removed value made this sudoku unsolvable
+                outcome_of_analysis = self.analise_empty_value(square_to_edit)
+
+                if outcome_of_analysis == -1:
+                    return -1
+
+                # Moves the checkpoint on, as values have changed
+                checkpoint = len(self.trail)
+
+        value_at_edited_square = self.get_value_from_pos(square_to_edit)
+        if not value_at_edited_square & FILLED:
+            return -1
+
+        else:
+            return self.solve()
+
+    def count_solutions(self, limit=2):
+        """
+        Counts the solutions of the sudoku with the same search as SudokuState.solve, but doesn't stop at the
+        first solution. Once a guess has been counted, it's removed from the possible values of its square, the
+        same as a wrong guess in solve, so every solution is only counted once.
+        This function is recursive. The state is rolled back to how it was before counting
+
+        Input:
+            limit: int, counting stops as soon as this many solutions have been found
+        Output:
+            int, the number of solutions, no more than limit
+        Raises SolveLimitExceeded if self.limits is reached
+        """
+        if self.limits is not None:
+            self.limits.count_node()
+
+        stats = self.stats
+        if stats is not None:
+            stats.nodes += 1
+
+        start = len(self.trail)
+
+        outcome = self.narrow()
+        if outcome != 0:
+            self.undo(start)
+            # 1 if narrow solved it, and 0 if it's unsolvable
+            return max(outcome, 0)
+
+        square_to_edit = min(self.get_empty_states().items(), key=lambda x: BIT_COUNT[x[1]])[0]
+
+        found = 0
+        while found < limit and not self.get_value_from_pos(square_to_edit) & FILLED:
+            guess_of_value = self.least_constraining_value(square_to_edit)
+            checkpoint = len(self.trail)
+
+            if stats is not None:
+                stats.guesses += 1
+                stats.depth += 1
+                stats.max_depth = max(stats.max_depth, stats.depth)
+
+            found_from_guess = 0
+            if self.fill_in_square(square_to_edit, guess_of_value) == 0:
+                found_from_guess = self.count_solutions(limit - found)
+
+            if stats is not None:
+                stats.depth -= 1
+                if found_from_guess == 0:
+                    stats.backtracks += 1
+
+            found += found_from_guess
+
+            # Every solution with this guess has been counted, so it can be removed from the possible values
+            self.undo(checkpoint)
+            self.remove_value(square_to_edit, guess_of_value)
+
+            if self.analise_empty_value(square_to_edit) == -1:
+                break
+
+        # analise_empty_value can fill in the last possible value of the square, which still has to be counted
+        if found < limit and self.get_value_from_pos(square_to_edit) & FILLED:
+            found += self.count_solutions(limit - found)
+
+        self.undo(start)
+        return found
+
+    def get_solved_values(self):
+        """
+        Solves the sudoku. Returns the solution as a flat list of 81 ints in row major order.
+        If the sudoku is unsolvable, then all values will be -1
+        """
+        # checks to see if this sudoku can be shown quickly to be unsolvable
+        # self.check will be -1 if this is the case
+        is_already_unsolvable = self.check()
+
+        # If it's already unsolvable, then there's no need to try solving it
+        if is_already_unsolvable == -1:
+            return self.get_proper_values(-1)
+
+        # If it's not shown to be unsolvable, then try to solve it with a recurive solver
+        else:
+            if self.stats is None:
+                return self.get_proper_values(self.solve())
+
+            start = time.perf_counter()
+            outcome = self.solve()
+            self.stats.total_time += time.perf_counter() - start
+            return self.get_proper_values(outcome)
+
+    def get_solved_numpy(self):
+        """
+        Solves the sudoku. Returns a 9X9 int8 numpy array of the solved sudoku.
+        If the sudoku is unsolvable, then all values will be -1
+        """
+        return values_to_numpy(self.get_solved_values())
+
+
+def values_to_numpy(values):
+    """
+    Turns a flat list of 81 values (-1 to 9) into a 9x9 int8 numpy array. The array is made in one go from the
+    bytes of a signed char array, rather than numpy working out the type of every int in the list
+    """
+    import numpy as np
+
+    return np.frombuffer(array("b", values), dtype=np.int8).reshape(9, 9)
+
+
+# Naked and hidden subsets, as techniques for SudokuState.narrow (see SudokuState.techniques). Naked subsets are
+# tried before hidden subsets of the same size, as they are cheaper to find
+SUBSET_TECHNIQUES = (
+    ("naked pair", SudokuState.naked_subsets, (2,)),
+    ("hidden pair", SudokuState.hidden_subsets, (2,)),
+    ("naked triple", SudokuState.naked_subsets, (3,)),
+    ("hidden triple", SudokuState.hidden_subsets, (3,)),
+    ("naked quad", SudokuState.naked_subsets, (4,)),
+    ("hidden quad", SudokuState.hidden_subsets, (4,)),
+)
+
+# Fish, as techniques for SudokuState.narrow. They take longer to look for than subsets, so are best put after them,
+# to only be looked for when nothing else removes any values
+FISH_TECHNIQUES = (
+    ("x-wing", SudokuState.fish, (2,)),
+    ("swordfish", SudokuState.fish, (3,)),
+    ("jellyfish", SudokuState.fish, (4,)),
+)
+
+# The techniques SudokuState.narrow uses by default once there are no singles left. Only locked candidates, as it's
+# cheap enough to save more time in guesses than it takes at every guess. With it, looking for subsets as well
+# costs more time than the guesses they save
+NARROW_TECHNIQUES = (
+    ("locked candidates", SudokuState.locked_candidates, ()),
+)
+
+# Every technique by name, see get_techniques
+TECHNIQUES = {technique[0]: technique for technique in NARROW_TECHNIQUES + SUBSET_TECHNIQUES + FISH_TECHNIQUES}
+TECHNIQUES["simple colouring"] = ("simple colouring", SudokuState.simple_colouring, ())
+
+
+def get_techniques(techniques):
+    """
+    Turns techniques for SudokuState.narrow, given as names from TECHNIQUES or as (name, SudokuState method,
+    arguments) tuples, into a tuple of (name, SudokuState method, arguments) tuples in the same order.
+    They are tried in that order, so cheaper techniques should come first, e.g.
+        ("locked candidates", "naked pair", "hidden pair", "x-wing", "swordfish")
+
+    Raises ValueError if a name isn't in TECHNIQUES
+    """
+    output = []
+    for technique in techniques:
+        if isinstance(technique, str):
+            if technique not in TECHNIQUES:
+                raise ValueError("Unknown technique {!r}, expected one of {}".format(technique, ", ".join(TECHNIQUES)))
+            technique = TECHNIQUES[technique]
+        output.append(technique)
+
+    return tuple(output)
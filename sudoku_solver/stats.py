@@ -0,0 +1,60 @@
+"""
+Counting the work done solving a sudoku, see SolveStats
+"""
+import collections
+
+
+class SolveStats:
+    """
+    Counts of the work done solving a sudoku, to tell why some puzzles take longer than others.
+    Filled in by SudokuState and DancingLinksSolver when their stats attribute is set to one of these,
+    see sudoku_solver(..., stats=True). When stats is None nothing is counted.
+
+    Attributes:
+        nodes: number of times solve (or search for DancingLinksSolver) was called
+        guesses: number of values guessed
+        backtracks: number of guesses that turned out to be wrong
+        fill_in_square_calls, analise_empty_value_calls: number of calls to these SudokuState methods
+        eliminations: dict of {technique: number of possible values removed from squares because of it}.
+                      Values removed from the neighbours of a filled in square count towards the technique that
+                      filled in the square
+        max_depth: the most guesses made on top of each other
+        narrow_time: seconds spent in SudokuState.narrow
+        total_time: seconds spent solving in total
+        cached: True if the solution came from a cache, in which case everything else is 0
+    """
+
+    __slots__ = ("nodes", "guesses", "backtracks", "fill_in_square_calls", "analise_empty_value_calls",
+                 "eliminations", "depth", "max_depth", "narrow_time", "total_time", "cached")
+
+    def __init__(self):
+        self.nodes = 0
+        self.guesses = 0
+        self.backtracks = 0
+        self.fill_in_square_calls = 0
+        self.analise_empty_value_calls = 0
+        self.eliminations = collections.Counter()
+
+        # The number of guesses currently on top of each other
+        self.depth = 0
+        self.max_depth = 0
+
+        self.narrow_time = 0.0
+        self.total_time = 0.0
+        self.cached = False
+
+    @property
+    def search_time(self):
+        """Seconds spent solving outside of SudokuState.narrow"""
+        return self.total_time - self.narrow_time
+
+    def as_dict(self):
+        """Returns the stats as a dict, for logging"""
+        output = {name: getattr(self, name) for name in self.__slots__ if name != "depth"}
+        output["eliminations"] = dict(self.eliminations)
+        output["search_time"] = self.search_time
+        return output
+
+    def __repr__(self):
+        fields = ("{}={!r}".format(name, value) for name, value in self.as_dict().items())
+        return "SolveStats({})".format(", ".join(fields))
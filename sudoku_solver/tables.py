@@ -0,0 +1,57 @@
+"""
+Lookup tables used by every solver. They only take a few milliseconds to build, so are built on import
+"""
+
+
+# Every square in the state is stored as a single int.
+# An empty square is a 9 bit mask of the values it could be, with value v stored in bit (v - 1).
+# A filled in square has the FILLED bit set, along with the bit of the value it was filled in with.
+ALL_VALUES = 0b111111111
+FILLED = 1 << 9
+
+# The bit that stands for a given value. VALUE_BIT[0] is 0 so empty input squares add nothing to a mask
+VALUE_BIT = (0,) + tuple(1 << (value - 1) for value in range(1, 10))
+
+# Lookup tables indexed by a mask of possible values (0 to 511)
+# BIT_COUNT[mask] is the number of values in the mask
+BIT_COUNT = tuple(bin(mask).count("1") for mask in range(512))
+
+# LOWEST_VALUE[mask] is the smallest value in the mask, or 0 if the mask is empty
+LOWEST_VALUE = (0,) + tuple((mask & -mask).bit_length() for mask in range(1, 512))
+
+# MASK_VALUES[mask] is a tuple of the values in the mask, in increasing order
+MASK_VALUES = tuple(tuple(value for value in range(1, 10) if mask & VALUE_BIT[value]) for mask in range(512))
+
+# Lookup tables of squares, built once on import.
+# Squares are numbered 0 to 80 in row major order, so the square at position (row, col) is square row * 9 + col
+POSITIONS = tuple(divmod(square, 9) for square in range(81))
+
+# The squares in each row, column, and box
+ROWS = tuple(tuple(row * 9 + col for col in range(9)) for row in range(9))
+COLUMNS = tuple(tuple(row * 9 + col for row in range(9)) for col in range(9))
+BOXES = tuple(tuple((box - box % 3 + i // 3) * 9 + box % 3 * 3 + i % 3 for i in range(9)) for box in range(9))
+
+# SQUARE_UNITS[square] is the row, the column, and the box that the square is in, in that order
+SQUARE_UNITS = tuple((ROWS[row], COLUMNS[col], BOXES[row - row % 3 + col // 3]) for row, col in POSITIONS)
+
+# UNITS is every row, then every column, then every box.
+# SQUARE_UNIT_INDEXES[square] is the index in UNITS of the row, the column, and the box that the square is in
+UNITS = ROWS + COLUMNS + BOXES
+SQUARE_UNIT_INDEXES = tuple((row, 9 + col, 18 + row - row % 3 + col // 3) for row, col in POSITIONS)
+
+# PEERS[square] is every square in the same row, column, or box as the square, not including the square itself
+PEERS = tuple(tuple(sorted(set(row + col + box) - {square})) for square, (row, col, box) in enumerate(SQUARE_UNITS))
+PEER_SETS = tuple(frozenset(peers) for peers in PEERS)
+
+# The squares where a row (or a column) crosses a box, 3 in a line. ROW_SEGMENTS[row][i] is the part of the row in
+# the i-th box along it, and COLUMN_SEGMENTS[col][i] the part of the column in the i-th box down it
+ROW_SEGMENTS = tuple(tuple(row[i * 3:i * 3 + 3] for i in range(3)) for row in ROWS)
+COLUMN_SEGMENTS = tuple(tuple(col[i * 3:i * 3 + 3] for i in range(3)) for col in COLUMNS)
+
+# The character written to a puzzle line (see sudoku_solver.lineformat) for each value of a square, indexed by
+# value + 1. -1 (no solution) is written as "-", and 0 (empty) as "."
+LINE_CHARACTERS = "-.123456789"
+
+# The value of each character a puzzle line can have, by character code. Empty squares can be "." or "0"
+LINE_CHARACTER_VALUES = {ord(character): value for value, character in enumerate(".123456789")}
+LINE_CHARACTER_VALUES[ord("0")] = 0